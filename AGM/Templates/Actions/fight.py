@@ -3,6 +3,7 @@ from typing import Union, Optional
 import random
 
 from AGM.Tools.IOUtilities.input import Input
+from AGM.Tools.IOUtilities.output import Output
 from AGM.Tools.ConsoleControl.console import Console
 
 from ..Objects.weapon import Weapon
@@ -49,13 +50,13 @@ class Fight:
     ((self.npc.defence + 100) / 200) * ((npc_weapon.defence + 100) / 200) + 
     ((self.npc.agility + 100) / 200) * ((npc_weapon.range + 100) / 400) + random.uniform(0, 1.5)) * 25
 
-    print(f"\nYou used: {player_weapon.name}\n{self.npc.name} used: {npc_weapon.name}")  # Display weapon information
+    Output.print(f"\nYou used: {player_weapon.name}\n{self.npc.name} used: {npc_weapon.name}")  # Display weapon information
 
     # Display performance information
     if player_performance > npc_performance:
-      print(f"\nYou performed better than {self.npc.name} this round!")
+      Output.print(f"\nYou performed better than {self.npc.name} this round!")
     elif player_performance < npc_performance:
-      print(f"\n{self.npc.name} performed better than you this round!")
+      Output.print(f"\n{self.npc.name} performed better than you this round!")
 
     # Calculate damages
     npc_damage_taken = int(round(self.__cap_value((self.player.offense + player_weapon.offense) * random.uniform(0.8, 1.2) * 0.5 - (self.npc.defence + npc_weapon.defence) * random.uniform(0.8, 1.2) * 0.5)))
@@ -1,10 +1,14 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
+
+from AGM.Tools.Preservation.shards import ShardReference
 
 from .race import Race
+from .stats import NPCStats
 
 from ..AdventureGame.game import AdventureGame
 from ..Actions.actions import Actions
 from ..Locations.site import Site
+from ..Locations.registry import EntityRegistry
 from ..Objects.item import Item
 from ..Objects.weapon import Weapon
 
@@ -13,6 +17,16 @@ class NPC:
   """
   The class containing all data about each non-playter character (NPC) in the game
   """
+  offense = NPCStats.attribute("offense")  # Stats live in the world's stat store columns while it has one
+  defence = NPCStats.attribute("defence")
+  agility = NPCStats.attribute("agility")
+  health = NPCStats.attribute("health")
+  max_health = NPCStats.attribute("max_health")
+  currency = NPCStats.attribute("currency")
+  tolerance = NPCStats.attribute("tolerance")
+  current_site = ShardReference()  # NPCs saved outside of their land's shard, such as in the respawn queue, refer to it by proxy until first accessed
+  current_area = ShardReference()
+
   def __init__(
     self, name: str, gender: str, race: Race, starting_site: Site, action_set: Actions, 
     can_move_automatically: bool=True, tolerance: int=50, 
@@ -60,6 +74,23 @@ class NPC:
     else:
       self.unarmed_weapon = unarmed_weapon
   
+  def __setattr__(self, name: str, value: Any) -> None:
+    """
+    Override the builtin __setattr__ to keep this NPC's place in its world's numeric indexes up to date
+    """
+    super().__setattr__(name, value)
+    if name in EntityRegistry.range_attributes and "current_site" in self.__dict__:
+      self.current_site.entity_registry().update(self, name)
+
+  def __getstate__(self) -> Dict[str, Any]:
+    """
+    Override the builtin __getstate__ to save this NPC's stats with it, rather than its slot in a stat store
+    """
+    state = {name: value for name, value in self.__dict__.items() if name not in ("stat_store", "stat_slot")}
+    if "stat_store" in self.__dict__:
+      state.update({field: getattr(self, field) for field in NPCStats.FIELDS})
+    return state
+
   @staticmethod
   def __cap_value(value: int, lower: int=0, upper: int=100) -> int:
     """
@@ -101,11 +132,20 @@ class NPC:
     self.__populate_inventory()
     self.current_site.add_npc(self)
   
+  def move_to(self, site: Site) -> None:
+    """
+    Moves this NPC from its current site to another
+    """
+    self.current_site.remove_npc(self)
+    site.add_npc(self)
+    self.current_site = site
+    self.current_area = site.area
+
   def kill(self, game: AdventureGame, respawn_later: bool=True) -> None:
     """
-    Kills this NPC and registers the death to the game if enabled
+    Kills this NPC and registers the death to the game if enabled, keeping its stats in the world's stat store (if it has one) until it respawns
     """
     if respawn_later:
       game.add_killed_npc(self)  # Register the death to the game
     self.health = 0
-    self.current_site.remove_npc(self)
+    self.current_site.remove_npc(self, keep_stats=respawn_later)  # NPCs that never respawn are released from the stat store straight away
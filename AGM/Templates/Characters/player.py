@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Optional, Any
 
 from AGM.Tools.IOUtilities.input import Input
+from AGM.Tools.Preservation.shards import ShardProxy, ShardReference
 
 from ..AdventureGame.game import AdventureGame
 from ..Locations.world import World
@@ -11,8 +12,11 @@ from ..Objects.weapon import Weapon
 
 class Player:
   """
-  The class containing all data about the player (PC) in the game
+  The class containing all data about the player (PC) in the game, which is saved whenever one of its attributes is reassigned (or after 'game.mark_changed(player)' for in-place changes, such as to its inventory)
   """
+  current_area = ShardReference()  # Areas and sites in other lands' shards are restored as proxies, which are swapped out on first access
+  current_site = ShardReference()
+
   def __init__(self, game: AdventureGame, name: str, world: World, action_set: Actions, starting_land: Optional[Land]=None, unarmed_weapon: Optional[Weapon]=None) -> None:
     self.game = game
     self.name = name
@@ -41,6 +45,30 @@ class Player:
     
     self.adjust_available_actions()
   
+  def __setattr__(self, name: str, value: Any) -> None:
+    """
+    Override the builtin __setattr__ to flag the player as changed in its game's next save
+    """
+    super().__setattr__(name, value)
+    game = self.__dict__.get("game")
+    if game is not None:
+      game.mark_changed(self)
+
+  @property
+  def current_land(self) -> Optional[Land]:
+    """
+    The land the player is currently in, which is loaded from its shard on first access
+    """
+    self.__dict__["_current_land"] = ShardProxy.unwrap(self._current_land)  # Swapping in the loaded land is not a change to save
+    return self._current_land
+
+  @current_land.setter
+  def current_land(self, land: Optional[Land]) -> None:
+    """
+    Moves the player into a land, loading it from its shard if needed
+    """
+    self._current_land = ShardProxy.unwrap(land)
+
   def do_action(self) -> None:
     """
     Carry out an inputted action
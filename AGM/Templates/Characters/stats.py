@@ -0,0 +1,215 @@
+from typing import Any, Callable, Iterable, List, Optional
+
+from array import array
+import math
+
+try:
+  import numpy
+except ImportError:  # Bulk operations fall back to plain loops over the columns
+  numpy = None
+
+
+class NPCStats:
+  """
+  A struct-of-arrays store of NPC stats, which keeps each stat in one contiguous column indexed by NPC slot so that day-wide updates are bulk operations
+  """
+  FIELDS = ("offense", "defence", "agility", "health", "max_health", "currency", "tolerance")
+
+  def __init__(self, world: Any=None) -> None:
+    self.world = world
+    self.columns = {field: array("d") for field in self.FIELDS}  # Doubles, as damage can be halved into fractions
+    self.live = array("b")
+    self.npcs: List[Optional[Any]] = []
+    self.free_slots: List[int] = []
+
+  def __len__(self) -> int:
+    """
+    Returns the number of NPCs attached to the store
+    """
+    return len(self.npcs) - len(self.free_slots)
+
+  @staticmethod
+  def attribute(field: str) -> property:
+    """
+    Returns a property for an NPC stat, which reads and writes the NPC's slot while it is attached to a store and the NPC itself otherwise
+    """
+    def getter(npc: Any) -> Any:
+      store = npc.__dict__.get("stat_store")
+      if store is None:
+        try:
+          return npc.__dict__[field]
+        except KeyError:
+          raise AttributeError(f"{type(npc).__name__!r} object has no attribute {field!r}") from None
+      return store.get(npc.__dict__["stat_slot"], field)
+
+    def setter(npc: Any, value: Any) -> None:
+      store = npc.__dict__.get("stat_store")
+      if store is None:
+        npc.__dict__[field] = value
+      else:
+        store.columns[field][npc.__dict__["stat_slot"]] = value
+    return property(getter, setter, doc=f"The NPC's {field}, kept in a stat store column while it is attached to one")
+
+  def get(self, slot: int, field: str) -> Any:
+    """
+    Returns a stat of the NPC in a slot, as an integer if it is a whole number
+    """
+    value = self.columns[field][slot]
+    return int(value) if value.is_integer() else value
+
+  def attach(self, npc: Any) -> int:
+    """
+    Moves an NPC's stats into a slot of the store, and returns the slot
+    """
+    if npc.__dict__.get("stat_store") is self:
+      return npc.__dict__["stat_slot"]
+    values = [npc.__dict__.pop(field, 0) for field in self.FIELDS]
+    if self.free_slots:
+      slot = self.free_slots.pop()
+      for field, value in zip(self.FIELDS, values):
+        self.columns[field][slot] = value
+      self.live[slot] = 1
+      self.npcs[slot] = npc
+    else:
+      slot = len(self.npcs)
+      for field, value in zip(self.FIELDS, values):
+        self.columns[field].append(value)
+      self.live.append(1)
+      self.npcs.append(npc)
+    npc.__dict__["stat_store"] = self
+    npc.__dict__["stat_slot"] = slot
+    return slot
+
+  def detach(self, npc: Any) -> None:
+    """
+    Moves an NPC's stats out of the store and back onto the NPC, freeing its slot
+    """
+    if npc.__dict__.get("stat_store") is not self:
+      return
+    slot = npc.__dict__.pop("stat_slot")
+    del npc.__dict__["stat_store"]
+    npc.__dict__.update({field: self.get(slot, field) for field in self.FIELDS})
+    self.live[slot] = 0
+    self.npcs[slot] = None
+    self.free_slots.append(slot)
+
+  def attach_land(self, land: Any) -> None:
+    """
+    Attaches every NPC at the sites of a land, such as once it has been loaded
+    """
+    for area in getattr(land, "areas", ()):  # Parts of a world unpickled in one piece, rather than from shards, may not be restored yet and are skipped
+      for site in getattr(area, "sites", ()):
+        for npc in getattr(site, "npcs", ()):
+          self.attach(npc)
+
+  def detach_land(self, land: Any) -> None:
+    """
+    Frees the slots of every NPC at the sites of a land, such as once it has been evicted from memory
+    """
+    for area in land.areas:
+      for site in area.sites:
+        for npc in site.npcs:
+          self.detach(npc)
+
+  def slots(self, npcs: Optional[Iterable[Any]]=None) -> List[int]:
+    """
+    Returns the slots of the given attached NPCs, or of every attached NPC if none are given
+    """
+    if npcs is None:
+      return [slot for slot, live in enumerate(self.live) if live]
+    return [npc.__dict__["stat_slot"] for npc in npcs if npc.__dict__.get("stat_store") is self]
+
+  def heal(self, npcs: Optional[Iterable[Any]]=None, amount: Optional[float]=None) -> None:
+    """
+    Heals the given NPCs (or every attached NPC) by an amount, or fully if no amount is given, without exceeding their max health
+    """
+    health, max_health = self.columns["health"], self.columns["max_health"]
+    if numpy is not None:
+      health_view, max_health_view = self.__view("health"), self.__view("max_health")
+      slots = slice(None) if npcs is None else numpy.array(self.slots(npcs), dtype=numpy.intp)
+      health_view[slots] = max_health_view[slots] if amount is None else numpy.minimum(health_view[slots] + amount, max_health_view[slots])
+    elif npcs is None and amount is None:
+      health[:] = max_health
+    else:
+      for slot in self.slots(npcs):
+        health[slot] = max_health[slot] if amount is None else min(health[slot] + amount, max_health[slot])
+    self.__changed("health")
+
+  def buff(self, npcs: Optional[Iterable[Any]], field: str, amount: float, lower: Optional[float]=0, upper: Optional[float]=100) -> None:
+    """
+    Adds an amount to a stat of the given NPCs (or every attached NPC), keeping it within bounds
+    """
+    self.apply(npcs, field, lambda value: value + amount, lower, upper)
+
+  def decay(self, npcs: Optional[Iterable[Any]], field: str, factor: float, lower: Optional[float]=0, upper: Optional[float]=None) -> None:
+    """
+    Multiplies a stat of the given NPCs (or every attached NPC) by a factor, keeping it within bounds
+    """
+    self.apply(npcs, field, lambda value: value * factor, lower, upper)
+
+  def apply(self, npcs: Optional[Iterable[Any]], field: str, operation: Callable[[Any], Any], lower: Optional[float]=None, upper: Optional[float]=None) -> None:
+    """
+    Replaces a stat of the given NPCs (or every attached NPC) with the result of an operation on it, which is given whole columns when NumPy is installed, keeping it within bounds
+    """
+    column = self.columns[field]
+    if numpy is not None:
+      view = self.__view(field)
+      slots = slice(None) if npcs is None else numpy.array(self.slots(npcs), dtype=numpy.intp)
+      view[slots] = numpy.clip(operation(view[slots]), lower, upper) if lower is not None or upper is not None else operation(view[slots])
+    else:
+      for slot in self.slots(npcs):
+        value = operation(column[slot])
+        if lower is not None and value < lower:
+          value = lower
+        if upper is not None and value > upper:
+          value = upper
+        column[slot] = value
+    self.__changed(field)
+
+  def where(self, field: str, low: Optional[float]=None, high: Optional[float]=None) -> List[Any]:
+    """
+    Returns every attached NPC with a stat within a range, which is inclusive below and exclusive above
+    """
+    column = self.columns[field]
+    if numpy is not None:
+      view, live = self.__view(field), numpy.frombuffer(self.live, dtype=numpy.int8)
+      mask = live.astype(bool)
+      if low is not None:
+        mask &= view >= low
+      if high is not None:
+        mask &= view < high
+      slots = numpy.flatnonzero(mask).tolist()
+      return [self.npcs[slot] for slot in slots]
+    return [self.npcs[slot] for slot, live in enumerate(self.live) if live and (low is None or column[slot] >= low) and (high is None or column[slot] < high)]
+
+  def dead(self) -> List[Any]:
+    """
+    Returns every attached NPC with no health left, including NPCs killed and awaiting respawn, which stay attached until they respawn or are detached
+    """
+    return self.where("health", high=math.nextafter(0.0, 1.0))
+
+  def __view(self, field: str) -> Any:
+    """
+    A mangled helper method to return a NumPy view sharing memory with a column, without copying it, which must not outlive the operation as columns cannot grow while viewed
+    """
+    return numpy.frombuffer(self.columns[field], dtype=numpy.float64)
+
+  def __changed(self, field: str) -> None:
+    """
+    A mangled helper method to mark a stat as changed in bulk in its world's entity registry, which re-sorts it on its next query
+    """
+    registry = getattr(self.world, "entities", None)
+    if registry is not None:
+      registry.invalidate(field)
+
+  def __getstate__(self) -> dict:
+    """
+    Saves nothing but the world, as each NPC's stats are saved with the NPC in its land's shard
+    """
+    return {"world": self.world}
+
+  def __setstate__(self, state: dict) -> None:
+    """
+    Restores an empty store, which NPCs are attached to again as their lands are loaded
+    """
+    self.__init__(**state)
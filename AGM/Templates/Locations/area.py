@@ -1,17 +1,25 @@
+from typing import Dict, Tuple
+
+from AGM.Tools.Preservation.shards import ShardMember
+
 from .land import Land
 from .site import Site
+from .errors import LocationNotFoundError
 
 from ..AdventureGame.game import AdventureGame
 
 
-class Area:
+class Area(ShardMember):
   """
-  A wrapper containing the necessary information to represent a 2nd-class location (area)
+  A wrapper containing the necessary information to represent a 2nd-class location (area), which is saved in its land's shard
   """
+  site_indexes = None  # Areas saved before sites were indexed build their index on first lookup
+
   def __init__(self, name: str, land: Land) -> None:
     self.name = name
     self.land = land
     self.sites = []
+    self.site_indexes: Dict[str, Site] = {}
     self.game = None  # Added upon game creation
   
   def add_site(self, site: Site) -> None:
@@ -19,12 +27,35 @@ class Area:
     Adds a site object into this area object
     """
     self.sites.append(site)
+    self.__site_index().setdefault(site.name, site)  # Lookups return the first site added with a name
   
   def get_site(self, name: str) -> Site:
     """
     Searches for and returns a site object within this area object from it's name
     """
-    return list(filter(lambda site: site.name == name, self.sites))[0]
+    site = self.__site_index().get(name)
+    if site is None:
+      raise LocationNotFoundError(f"The requested site ({name}) does not exist in this area ({self.name})") from None
+    return site
+
+  def shard_owner(self) -> Land:
+    """
+    Returns the land whose shard this area object is saved in
+    """
+    return self.land
+
+  def shard_member_path(self) -> Tuple[str, ...]:
+    """
+    Returns the path of this area object within its land's shard
+    """
+    return (self.name, )
+
+  @property
+  def path(self) -> str:
+    """
+    The location path of this area object, as accepted by World.resolve
+    """
+    return f"{self.land.name}/{self.name}"
 
   def __str__(self) -> str:
     """
@@ -39,3 +70,13 @@ class Area:
     self.game = game
     for site in self.sites:
       site.add_game(self.game)
+
+  def __site_index(self) -> Dict[str, Site]:
+    """
+    A mangled helper method to return the index of site names, building it if it is missing
+    """
+    if self.site_indexes is None:
+      self.site_indexes = {}
+      for site in self.sites:
+        self.site_indexes.setdefault(site.name, site)
+    return self.site_indexes
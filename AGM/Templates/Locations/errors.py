@@ -0,0 +1,30 @@
+"""
+A collection of custom errors for the location templates
+"""
+
+
+class LocationNotFoundError(IndexError):
+  """
+  An exception raised when a named land, area or site does not exist
+  """
+  def __init__(self, msg: str="Location Not Found") -> None:
+    self.message = msg
+    super().__init__(self.message)
+
+
+class NPCNotFoundError(IndexError):
+  """
+  An exception raised when a named NPC does not exist at a site
+  """
+  def __init__(self, msg: str="NPC Not Found") -> None:
+    self.message = msg
+    super().__init__(self.message)
+
+
+class RouteNotFoundError(ValueError):
+  """
+  An exception raised when there is no route between two sites
+  """
+  def __init__(self, msg: str="Route Not Found") -> None:
+    self.message = msg
+    super().__init__(self.message)
@@ -1,17 +1,25 @@
+from typing import Dict, Tuple, Any
+
+from AGM.Tools.Preservation.shards import Shardable
+
 from .world import World
 from .area import Area
+from .errors import LocationNotFoundError
 
 from ..AdventureGame.game import AdventureGame
 
 
-class Land:
+class Land(Shardable):
   """
-  A wrapper containing the necessary information to represent a 3rd-class location (land)
+  A wrapper containing the necessary information to represent a 3rd-class location (land), which is saved in its own shard
   """
+  area_indexes = None  # Lands saved before areas were indexed build their index on first lookup
+
   def __init__(self, name: str, world: World) -> None:
     self.name = name
     self.world = world
     self.areas = []
+    self.area_indexes: Dict[str, Area] = {}
     self.game = None  # Added upon game creation
   
   def add_area(self, area: Area) -> None:
@@ -19,13 +27,36 @@ class Land:
     Adds an area object into this land object
     """
     self.areas.append(area)
+    self.__area_index().setdefault(area.name, area)  # Lookups return the first area added with a name
   
   def get_area(self, name: str) -> Area:
     """
     Searches for and returns a area object within this land object from it's name
     """
-    return list(filter(lambda area: area.name == name, self.areas))[0]  # Retrives the first occurrance
+    area = self.__area_index().get(name)
+    if area is None:
+      raise LocationNotFoundError(f"The requested area ({name}) does not exist in this land ({self.name})") from None
+    return area
   
+  def resolve_shard_member(self, path: Tuple[str, ...]) -> Any:
+    """
+    Fetches an area, or a site within one, from its path within this land's shard
+    """
+    area = self.get_area(path[0])
+    if len(path) == 1:
+      return area
+    return area.get_site(path[1])
+
+  def __setstate__(self, state: Dict[str, Any]) -> None:
+    """
+    Restores this land object when it is loaded from its shard, attaching and registering its NPCs and items with its world
+    """
+    self.__dict__.update(state)
+    if getattr(self.world, "stats", None) is not None:
+      self.world.stats.attach_land(self)
+    if getattr(self.world, "entities", None) is not None:
+      self.world.entities.register_land(self)
+
   def __str__(self) -> str:
     """
     String representation of this land object
@@ -39,3 +70,13 @@ class Land:
     self.game = game
     for area in self.areas:
       area.add_game(self.game)
+
+  def __area_index(self) -> Dict[str, Area]:
+    """
+    A mangled helper method to return the index of area names, building it if it is missing
+    """
+    if self.area_indexes is None:
+      self.area_indexes = {}
+      for area in self.areas:
+        self.area_indexes.setdefault(area.name, area)
+    return self.area_indexes
@@ -0,0 +1,205 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import bisect
+import math
+
+
+class EntityRegistry:
+  """
+  An index of every NPC and item placed at a site in the lands held in memory, with secondary indexes for answering queries without walking the world
+  """
+  category_attributes = ("kind", "race", "site", "area", "land")
+  range_attributes = ("rarity", "cost", "health", "max_health", "offense", "defence", "agility", "currency")  # Numeric attributes kept in sorted indexes, where an entity has them
+
+  def __init__(self) -> None:
+    self.entities: Dict[int, Any] = {}
+    self.sites: Dict[int, Any] = {}
+    self.categories: Dict[str, Dict[Any, Set[int]]] = {attribute: {} for attribute in self.category_attributes}
+    self.ranges: Dict[str, List[Tuple[Any, int]]] = {attribute: [] for attribute in self.range_attributes}  # Sorted (value, entity id) pairs
+    self.range_values: Dict[str, Dict[int, Any]] = {attribute: {} for attribute in self.range_attributes}
+    self.stale: Set[str] = set()  # Numeric attributes changed in bulk, which are re-sorted on their next query rather than per entity
+
+  def __len__(self) -> int:
+    """
+    Returns the number of registered entities
+    """
+    return len(self.entities)
+
+  def __contains__(self, entity: Any) -> bool:
+    """
+    Checks whether an entity is registered
+    """
+    return id(entity) in self.entities
+
+  def register(self, entity: Any, site: Any) -> None:
+    """
+    Registers an NPC or item at a site, moving it if it is already registered elsewhere
+    """
+    if id(entity) in self.entities:
+      self.unregister(entity)
+    entity_id = id(entity)
+    self.entities[entity_id] = entity
+    self.sites[entity_id] = site
+    for attribute, key in self.__category_keys(entity, site):
+      self.categories[attribute].setdefault(key, set()).add(entity_id)
+    for attribute in self.range_attributes:
+      self.__index_value(entity, attribute)
+
+  def unregister(self, entity: Any) -> None:
+    """
+    Removes an NPC or item from every index, if it is registered
+    """
+    entity_id = id(entity)
+    if entity_id not in self.entities:
+      return
+    for attribute, key in self.__category_keys(entity, self.sites[entity_id]):
+      members = self.categories[attribute].get(key)
+      if members is not None:
+        members.discard(entity_id)
+        if not members:
+          del self.categories[attribute][key]
+    for attribute in self.range_attributes:
+      self.__unindex_value(entity_id, attribute)
+    del self.entities[entity_id]
+    del self.sites[entity_id]
+
+  def update(self, entity: Any, attribute: str) -> None:
+    """
+    Re-sorts a registered entity after one of its numeric attributes has changed
+    """
+    if attribute in self.range_values and attribute not in self.stale and id(entity) in self.entities:
+      self.__unindex_value(id(entity), attribute)
+      self.__index_value(entity, attribute)
+
+  def invalidate(self, attribute: str) -> None:
+    """
+    Marks a numeric attribute as changed across many entities at once, so that its index is rebuilt on its next query
+    """
+    if attribute in self.range_values:
+      self.stale.add(attribute)
+
+  def register_land(self, land: Any) -> None:
+    """
+    Registers every NPC and item at the sites of a land, such as once it has been loaded
+    """
+    for area in getattr(land, "areas", ()):  # Parts of a world unpickled in one piece, rather than from shards, may not be restored yet and are skipped
+      for site in getattr(area, "sites", ()):
+        for entity in [*getattr(site, "npcs", ()), *getattr(site, "items", ())]:
+          self.register(entity, site)
+
+  def unregister_land(self, land_name: str) -> None:
+    """
+    Removes every NPC and item in a land from the indexes, such as once it has been evicted from memory
+    """
+    for entity_id in list(self.categories["land"].get(land_name, ())):
+      self.unregister(self.entities[entity_id])
+
+  def site_of(self, entity: Any) -> Any:
+    """
+    Returns the site a registered entity was registered at
+    """
+    return self.sites[id(entity)]
+
+  def query(self, kind: Optional[str]=None, race: Optional[str]=None, site: Optional[str]=None, area: Optional[str]=None, land: Optional[str]=None, **ranges: Tuple[Optional[Any], Optional[Any]]) -> List[Any]:
+    """
+    Returns the entities matching every given filter, by class name (including base classes), race name, location path and numeric ranges such as 'health=(None, 30)', which are inclusive below and exclusive above
+    """
+    unknown = set(ranges) - set(self.range_attributes)
+    if unknown:
+      raise ValueError(f"Only the numeric attributes {self.range_attributes} can be queried by range, not {sorted(unknown)}") from None
+    for attribute in self.stale.intersection(ranges):
+      self.__reindex(attribute)
+    categories = {"kind": kind, "race": race, "site": site, "area": area, "land": land}
+    candidates = sorted((self.categories[attribute].get(key, set()) for attribute, key in categories.items() if key is not None), key=len)
+    spans = sorted(((attribute, *self.__span(attribute, low, high)) for attribute, (low, high) in ranges.items()), key=lambda span: span[2] - span[1])
+    if not candidates and not spans:
+      return list(self.entities.values())
+
+    if candidates and (not spans or len(candidates[0]) <= spans[0][2] - spans[0][1]):  # Starts from whichever index narrows the search the most
+      matches = set(candidates[0])
+    else:
+      attribute, start, end = spans.pop(0)
+      matches = {entity_id for _, entity_id in self.ranges[attribute][start:end]}
+    for members in candidates:
+      matches.intersection_update(members)
+    for attribute, _, _ in spans:
+      low, high = ranges[attribute]
+      values = self.range_values[attribute]
+      matches = {entity_id for entity_id in matches if entity_id in values and (low is None or values[entity_id] >= low) and (high is None or values[entity_id] < high)}
+    return [self.entities[entity_id] for entity_id in matches]
+
+  def sites_holding(self, **filters: Any) -> List[Any]:
+    """
+    Returns the distinct sites holding at least one entity that matches a query
+    """
+    sites = {}
+    for entity in self.query(**filters):
+      site = self.sites[id(entity)]
+      sites[id(site)] = site
+    return list(sites.values())
+
+  def __span(self, attribute: str, low: Optional[Any], high: Optional[Any]) -> Tuple[int, int]:
+    """
+    A mangled helper method to find the slice of a sorted index holding the values within a range
+    """
+    index = self.ranges[attribute]
+    start = 0 if low is None else bisect.bisect_left(index, (low, -math.inf))
+    end = len(index) if high is None else bisect.bisect_left(index, (high, -math.inf))
+    return start, end
+
+  def __reindex(self, attribute: str) -> None:
+    """
+    A mangled helper method to rebuild the sorted index of a numeric attribute from every registered entity
+    """
+    self.range_values[attribute] = {}
+    self.ranges[attribute] = []
+    for entity in self.entities.values():
+      value = getattr(entity, attribute, None)
+      if isinstance(value, (int, float)) and not isinstance(value, bool):
+        self.range_values[attribute][id(entity)] = value
+    self.ranges[attribute] = sorted((value, entity_id) for entity_id, value in self.range_values[attribute].items())
+    self.stale.discard(attribute)
+
+  def __index_value(self, entity: Any, attribute: str) -> None:
+    """
+    A mangled helper method to add an entity's current value of a numeric attribute to its sorted index
+    """
+    value = getattr(entity, attribute, None)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+      bisect.insort(self.ranges[attribute], (value, id(entity)))
+      self.range_values[attribute][id(entity)] = value
+
+  def __unindex_value(self, entity_id: int, attribute: str) -> None:
+    """
+    A mangled helper method to remove an entity's indexed value of a numeric attribute from its sorted index
+    """
+    value = self.range_values[attribute].pop(entity_id, None)
+    if value is not None:
+      index = self.ranges[attribute]
+      del index[bisect.bisect_left(index, (value, entity_id))]
+
+  @staticmethod
+  def __category_keys(entity: Any, site: Any) -> Iterable[Tuple[str, Any]]:
+    """
+    A mangled helper method to list the category index keys an entity is filed under
+    """
+    for cls in type(entity).__mro__[:-1]:
+      yield "kind", cls.__name__
+    race = getattr(entity, "race", None)
+    if race is not None:
+      yield "race", race.name
+    yield "site", site.path
+    yield "area", site.area.path
+    yield "land", site.area.land.name
+
+  def __getstate__(self) -> dict:
+    """
+    Saves nothing, as the registry refers to entities saved in land shards and is rebuilt as those lands are loaded
+    """
+    return {}
+
+  def __setstate__(self, state: dict) -> None:
+    """
+    Restores an empty registry
+    """
+    self.__init__()
@@ -0,0 +1,122 @@
+from typing import Dict, Optional, Set, Any
+
+from collections import OrderedDict
+
+from AGM.Tools.Preservation.shards import ShardProxy
+
+
+class LandResidency:
+  """
+  A budget on the lands of a world kept in memory, which writes the least recently used lands back to their shards once it is exceeded, and is attached with 'world.residency = LandResidency(world, ...)'
+  """
+  def __init__(self, world: Any, max_lands: Optional[int]=None, max_bytes: Optional[int]=None) -> None:
+    self.world = world
+    self.max_lands = max_lands
+    self.max_bytes = max_bytes  # Measured by the encoded size of each land's shard, as of when it was last read or written
+    self.recent: OrderedDict = OrderedDict()  # The keys of accessed lands, least recently used first
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def access(self, key: str, land: Any) -> None:
+    """
+    Records an access to a land through the world, counting whether it was already in memory
+    """
+    if self.world.game is not None and key in self.world.game.loaded_shards():
+      self.hits += 1
+    elif isinstance(land, ShardProxy):
+      self.misses += 1
+    else:  # A land created in this session, which is in memory but has not been saved to a shard yet
+      self.hits += 1
+    self.recent[key] = None
+    self.recent.move_to_end(key)
+
+  def pinned(self) -> Set[str]:
+    """
+    Returns the keys of the lands that are never evicted, which are the player's current land and the lands connected to it
+    """
+    player = getattr(self.world.game, "player", None)
+    land = None if player is None else player.__dict__.get("_current_land")  # Read without the property, which would load it
+    if land is None:
+      return set()
+    key = land.shard_key()
+    routes = self.world.routes
+    return {key} if routes is None else {key, *routes.land_neighbours(key)}
+
+  def enforce(self, *keep: str) -> int:
+    """
+    Evicts the least recently used lands that are neither pinned nor kept until the budget is met, and returns how many were evicted
+    """
+    game = self.world.game
+    if game is None or (self.max_lands is None and self.max_bytes is None):
+      return 0
+    resident = game.loaded_shards()
+    pinned = self.pinned().union(keep)
+    candidates = [key for key in resident if key not in self.recent] + [key for key in self.recent if key in resident]  # Lands loaded without going through the world are the first to go
+    evicted = 0
+    for key in candidates:
+      if not self.__over_budget(resident):
+        break
+      if key in pinned:
+        continue
+      self.__evict(key)
+      del resident[key]
+      evicted += 1
+    return evicted
+
+  def stats(self) -> Dict[str, Any]:
+    """
+    Returns the residency counters and current footprint, for tuning the budget
+    """
+    resident = {} if self.world.game is None else self.world.game.loaded_shards()
+    accesses = self.hits + self.misses
+    return {
+      "hits": self.hits,
+      "misses": self.misses,
+      "evictions": self.evictions,
+      "hit_rate": self.hits / accesses if accesses else 0.0,
+      "resident_lands": len(resident),
+      "resident_bytes": sum(resident.values())
+    }
+
+  def reset_stats(self) -> None:
+    """
+    Resets the hit, miss and eviction counters
+    """
+    self.hits = self.misses = self.evictions = 0
+
+  def __over_budget(self, resident: Dict[str, int]) -> bool:
+    """
+    A mangled helper method to check whether the resident lands exceed either limit of the budget
+    """
+    return (self.max_lands is not None and len(resident) > self.max_lands) or (self.max_bytes is not None and sum(resident.values()) > self.max_bytes)
+
+  def __evict(self, key: str) -> None:
+    """
+    A mangled helper method to write a land to its shard and replace the world's reference to it with a proxy that reloads it on access
+    """
+    land = next((land for land in self.world.lands if not isinstance(land, ShardProxy) and land.shard_key() == key), None)
+    proxy = self.world.game.unload_shard(key)  # Saves each NPC's stats from the stat store before its slot is freed
+    if land is not None and self.world.stats is not None:
+      self.world.stats.detach_land(land)
+    land_index = None if self.world.land_indexes is None else self.world.land_indexes.get(key)
+    if land_index is None or land_index >= len(self.world.lands) or self.world.lands[land_index].shard_key() != key:  # The lands list was changed directly, so it is searched instead
+      land_index = next((idx for idx, land in enumerate(self.world.lands) if land.shard_key() == key), None)
+    if land_index is not None:
+      self.world.lands[land_index] = proxy
+    if self.world.entities is not None:
+      self.world.entities.unregister_land(key)
+    self.recent.pop(key, None)
+    self.evictions += 1
+
+  def __getstate__(self) -> dict:
+    """
+    Saves nothing but the budget, as residency describes only the current session
+    """
+    return {"world": self.world, "max_lands": self.max_lands, "max_bytes": self.max_bytes}
+
+  def __setstate__(self, state: dict) -> None:
+    """
+    Restores the budget with empty counters
+    """
+    self.__init__(**state)
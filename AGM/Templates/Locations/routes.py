@@ -0,0 +1,192 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from collections import OrderedDict
+import heapq
+import math
+
+
+class RouteMap:
+  """
+  A weighted graph of the connections between sites, keyed by their location paths, with cached shortest-path routing
+  """
+  max_cached_tables = 256  # The number of per-site distance and next-hop tables kept before the least recently used are dropped
+  max_cached_routes = 4096
+
+  def __init__(self) -> None:
+    self.edges: Dict[str, Dict[str, float]] = {}
+    self.reverse_edges: Dict[str, Dict[str, float]] = {}  # Kept so that one search from a target serves every site travelling towards it
+    self.positions: Dict[str, Tuple[float, float]] = {}
+    self.__reset_caches()
+
+  def connect(self, source: str, target: str, weight: float=1.0, both_ways: bool=True) -> None:
+    """
+    Adds (or re-weights) a connection between two sites, in both directions unless stated otherwise
+    """
+    if weight < 0:
+      raise ValueError(f"A connection cannot have a negative weight ({weight})") from None
+    self.edges.setdefault(source, {})[target] = weight
+    self.reverse_edges.setdefault(target, {})[source] = weight
+    self.edges.setdefault(target, {})
+    self.reverse_edges.setdefault(source, {})
+    if both_ways:
+      self.connect(target, source, weight, both_ways=False)
+    self.__reset_caches()
+
+  def disconnect(self, source: str, target: str, both_ways: bool=True) -> None:
+    """
+    Removes the connection between two sites, in both directions unless stated otherwise
+    """
+    self.edges.get(source, {}).pop(target, None)
+    self.reverse_edges.get(target, {}).pop(source, None)
+    if both_ways:
+      self.disconnect(target, source, both_ways=False)
+    self.__reset_caches()
+
+  def place(self, node: str, x: float, y: float) -> None:
+    """
+    Gives a site a position, which lets routes between positioned sites be found with A* rather than Dijkstra's algorithm
+    """
+    self.positions[node] = (x, y)
+    self.__reset_caches()
+
+  def neighbours(self, node: str) -> Dict[str, float]:
+    """
+    Returns the sites directly reachable from a site, mapped to the weight of each connection
+    """
+    return dict(self.edges.get(node, {}))
+
+  def land_neighbours(self, land: str) -> Set[str]:
+    """
+    Returns the names of the other lands that have a site directly connected to a site in a land
+    """
+    if self.__land_neighbours is None:
+      self.__land_neighbours = {}
+      for source, targets in self.edges.items():
+        for target in targets:
+          if source.split("/", 1)[0] != target.split("/", 1)[0]:
+            self.__land_neighbours.setdefault(source.split("/", 1)[0], set()).add(target.split("/", 1)[0])
+    return self.__land_neighbours.get(land, set())
+
+  def distances(self, source: str) -> Dict[str, float]:
+    """
+    Returns the shortest distance from a site to every site reachable from it
+    """
+    return self.__table(source, reverse=False)[0]
+
+  def next_hops(self, target: str) -> Dict[str, str]:
+    """
+    Maps every site that can reach a target to the next site on its shortest route there, from a single search
+    """
+    return self.__table(target, reverse=True)[1]
+
+  def route(self, source: str, target: str) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the sites along the shortest route between two sites (including both), or None if there is no route
+    """
+    key = (source, target)
+    if key in self.__routes:
+      self.__routes.move_to_end(key)
+      return self.__routes[key]
+    if source in self.__tables.get(False, {}):  # A cached distance table already holds the route
+      route = self.__walk(self.__table(source, reverse=False)[1], target, source)
+      route = None if route is None else tuple(reversed(route))
+    elif target in self.__tables.get(True, {}):
+      route = self.__walk(self.__table(target, reverse=True)[1], source, target)
+    else:
+      route = self.__search(source, target)
+    self.__routes[key] = route
+    if len(self.__routes) > self.max_cached_routes:
+      self.__routes.popitem(last=False)
+    return route
+
+  def route_length(self, route: Iterable[str]) -> float:
+    """
+    Returns the total weight of the connections along a route
+    """
+    route = list(route)
+    return sum(self.edges[source][target] for source, target in zip(route, route[1:]))
+
+  def __reset_caches(self) -> None:
+    """
+    A mangled helper method to drop every cached table and route, as a changed connection can change any of them
+    """
+    self.__tables: Dict[bool, OrderedDict] = {False: OrderedDict(), True: OrderedDict()}
+    self.__routes: OrderedDict = OrderedDict()
+    self.__land_neighbours: Optional[Dict[str, Set[str]]] = None
+
+  def __table(self, node: str, reverse: bool) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """
+    A mangled helper method to return the cached distance and predecessor tables of a full search from (or, reversed, towards) a site
+    """
+    tables = self.__tables[reverse]
+    if node in tables:
+      tables.move_to_end(node)
+      return tables[node]
+    tables[node] = self.__dijkstra(node, self.reverse_edges if reverse else self.edges)
+    if len(tables) > self.max_cached_tables:
+      tables.popitem(last=False)
+    return tables[node]
+
+  @staticmethod
+  def __dijkstra(source: str, edges: Dict[str, Dict[str, float]]) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """
+    A mangled helper method to find the shortest distance from a site to every reachable site, along with the site before each on its route
+    """
+    distances = {source: 0.0}
+    previous = {}
+    queue = [(0.0, source)]
+    while queue:
+      distance, node = heapq.heappop(queue)
+      if distance > distances[node]:  # A stale queue entry, for a node since reached more cheaply
+        continue
+      for neighbour, weight in edges.get(node, {}).items():
+        if distance + weight < distances.get(neighbour, math.inf):
+          distances[neighbour] = distance + weight
+          previous[neighbour] = node
+          heapq.heappush(queue, (distance + weight, neighbour))
+    return distances, previous
+
+  def __search(self, source: str, target: str) -> Optional[Tuple[str, ...]]:
+    """
+    A mangled helper method to find a single route, with A* if both sites are positioned and with Dijkstra's algorithm (stopping at the target) otherwise
+    """
+    goal = self.positions.get(target)
+    heuristic = (lambda node: math.dist(self.positions[node], goal) if node in self.positions else 0.0) if goal is not None and source in self.positions else (lambda node: 0.0)
+    distances = {source: 0.0}
+    previous = {}
+    queue = [(heuristic(source), source)]
+    while queue:
+      _, node = heapq.heappop(queue)
+      if node == target:
+        return tuple(reversed(self.__walk(previous, target, source)))
+      for neighbour, weight in self.edges.get(node, {}).items():
+        if distances[node] + weight < distances.get(neighbour, math.inf):
+          distances[neighbour] = distances[node] + weight
+          previous[neighbour] = node
+          heapq.heappush(queue, (distances[neighbour] + heuristic(neighbour), neighbour))
+    return None
+
+  @staticmethod
+  def __walk(previous: Dict[str, str], start: str, end: str) -> Optional[List[str]]:
+    """
+    A mangled helper method to follow a predecessor table from a site back to the root of its search
+    """
+    if start != end and start not in previous:
+      return None
+    route = [start]
+    while route[-1] != end:
+      route.append(previous[route[-1]])
+    return route
+
+  def __getstate__(self) -> dict:
+    """
+    Saves only the connections and positions, as the cached tables are rebuilt on demand
+    """
+    return {"edges": self.edges, "reverse_edges": self.reverse_edges, "positions": self.positions}
+
+  def __setstate__(self, state: dict) -> None:
+    """
+    Restores the connections and positions, with empty caches
+    """
+    self.__dict__.update(state)
+    self.__reset_caches()
@@ -1,6 +1,10 @@
-from typing import List
+from typing import Dict, List, Tuple, Any
+
+from AGM.Tools.Preservation.shards import ShardMember
 
 from .area import Area
+from .errors import NPCNotFoundError
+from .registry import EntityRegistry
 
 from ..Actions.actions import Actions
 from ..Characters.npc import NPC
@@ -8,15 +12,18 @@ from ..Objects.item import Item
 from ..AdventureGame.game import AdventureGame
 
 
-class Site:
+class Site(ShardMember):
   """
-  A wrapper containing the necessary information to represent a 1st-class location (site)
+  A wrapper containing the necessary information to represent a 1st-class location (site), which is saved in its land's shard
   """
+  npc_indexes = None  # Sites saved before NPCs were indexed build their index on first lookup
+
   def __init__(self, name: str, area: Area, actions_available: Actions, descriptions: List[str]) -> None:
     self.name = name
     self.area = area
     self.actions_available = actions_available
     self.npcs = []
+    self.npc_indexes: Dict[str, NPC] = {}
     self.items = []
     self.mission_clues = []
     self.descriptions = descriptions
@@ -27,12 +34,49 @@ class Site:
     Adds an NPC to this site object
     """
     self.npcs.append(npc)
+    self.__npc_index().setdefault(npc.name, npc)  # Lookups return the first NPC added with a name
+    if self.area.land.world.stats is not None:
+      self.area.land.world.stats.attach(npc)
+    self.entity_registry().register(npc, self)
 
   def add_item(self, item: Item) -> None:
     """
     Adds an item to this site object
     """
     self.items.append(item)
+    self.entity_registry().register(item, self)
+
+  def remove_item(self, item: Item) -> None:
+    """
+    Removes an item from this site object
+    """
+    self.items.remove(item)
+    self.entity_registry().unregister(item)
+
+  def entity_registry(self) -> EntityRegistry:
+    """
+    Returns the registry of entities of the world this site object is in
+    """
+    return self.area.land.world.entity_registry()
+
+  def shard_owner(self) -> Any:
+    """
+    Returns the land whose shard this site object is saved in
+    """
+    return self.area.land
+
+  def shard_member_path(self) -> Tuple[str, ...]:
+    """
+    Returns the path of this site object within its land's shard
+    """
+    return (self.area.name, self.name)
+
+  @property
+  def path(self) -> str:
+    """
+    The location path of this site object, as accepted by World.resolve
+    """
+    return f"{self.area.land.name}/{self.area.name}/{self.name}"
 
   def __str__(self):
     """
@@ -40,24 +84,41 @@ class Site:
     """
     return f"{self.name}"
   
-  def remove_npc(self, npc: NPC) -> None:
+  def remove_npc(self, npc: NPC, keep_stats: bool=False) -> None:
     """
-    Removes an NPC from this site object
+    Removes an NPC from this site object, freeing its slot in the world's stat store unless it is kept (such as while the NPC awaits respawn)
     """
     self.npcs.remove(npc)
+    self.entity_registry().unregister(npc)
+    if self.area.land.world.stats is not None and not keep_stats:
+      self.area.land.world.stats.detach(npc)
+    if self.__npc_index().get(npc.name) is npc:  # Another NPC of the same name, if there is one, takes its place in the index
+      del self.npc_indexes[npc.name]
+      replacement = next((other for other in self.npcs if other.name == npc.name), None)
+      if replacement is not None:
+        self.npc_indexes[npc.name] = replacement
 
   def get_npc(self, npc_name: str) -> NPC:
     """
     Searches for and returns and NPC object from this site object from its name
     """
-    try:
-      npc_index = [npc.name for npc in self.npcs].index(npc_name)
-    except ValueError:
-      raise IndexError(f"The requested NPC ({npc_name}) does not exist at this site ({self.name})")
-    return self.npcs[npc_index]
+    npc = self.__npc_index().get(npc_name)
+    if npc is None:
+      raise NPCNotFoundError(f"The requested NPC ({npc_name}) does not exist at this site ({self.name})") from None
+    return npc
 
   def add_game(self, game: AdventureGame) -> None:
     """
     Adds the game object into this site object
     """
     self.game = game
+
+  def __npc_index(self) -> Dict[str, NPC]:
+    """
+    A mangled helper method to return the index of NPC names, building it if it is missing
+    """
+    if self.npc_indexes is None:
+      self.npc_indexes = {}
+      for npc in self.npcs:
+        self.npc_indexes.setdefault(npc.name, npc)
+    return self.npc_indexes
@@ -1,40 +1,180 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import functools
+
+from AGM.Tools.Preservation.shards import ShardProxy
+
 from .land import Land
+from .routes import RouteMap
+from .residency import LandResidency
+from .registry import EntityRegistry
+from .errors import LocationNotFoundError, RouteNotFoundError
 
+from ..Characters.stats import NPCStats
 from ..AdventureGame.game import AdventureGame
 
+if TYPE_CHECKING:
+  from .area import Area
+  from .site import Site
+  from ..Characters.npc import NPC
+
 
 class World:
   """
   A wrapper containing the necessary information to represent a 4th-class location (world)
   """
+  land_indexes = None  # Worlds saved before lands were indexed build their index on first lookup
+  routes = None  # Worlds saved before sites were connected start with no connections
+  residency: Optional[LandResidency] = None  # Every land stays in memory once loaded unless a residency budget is set
+  entities: Optional[EntityRegistry] = None  # Worlds saved before entities were registered build their registry on first use
+  stats: Optional[NPCStats] = None  # NPCs keep their own stats unless the world has a stat store
+
   def __init__(self, name: str) -> None:
     self.name = name
     self.lands = []
+    self.land_indexes: Dict[str, int] = {}  # Maps each land's shard key to its position, as unloaded lands are proxies that are swapped out once loaded
+    self.routes = RouteMap()
+    self.entities = EntityRegistry()
     self.game = None  # Added upon game creation
-  
+
   def get_land(self, name: str) -> Land:
     """
-    Searches for and returns a land object within this world object from it's name
+    Searches for and returns a land object within this world object from it's name, loading it from its shard if needed (and evicting others if over the residency budget)
+    """
+    land_index = self.__land_index().get(name)
+    if land_index is None or land_index >= len(self.lands) or self.lands[land_index].shard_key() != name:  # The lands list was changed directly, so the index is rebuilt
+      self.land_indexes = None
+      land_index = self.__land_index().get(name)
+      if land_index is None:
+        raise LocationNotFoundError(f"The requested land ({name}) does not exist in this world ({self.name})") from None
+    if self.residency is not None:
+      self.residency.access(name, self.lands[land_index])
+    self.lands[land_index] = ShardProxy.unwrap(self.lands[land_index])
+    land = self.lands[land_index]
+    if self.residency is not None:
+      self.residency.enforce(name)  # The land being returned is never the one evicted
+    return land
+
+  def resolve(self, path: str) -> Union[Land, "Area", "Site"]:
+    """
+    Returns the land, area or site at a path of names separated by slashes, such as "Land/Area/Site"
+    """
+    names = World.__compile_path(path)
+    try:
+      location = self.get_land(names[0])
+      if len(names) > 1:
+        location = location.get_area(names[1])
+      if len(names) > 2:
+        location = location.get_site(names[2])
+    except LocationNotFoundError as error:
+      raise LocationNotFoundError(f"Nothing exists at {path!r}: {error.message}") from None
+    return location
+
+  def entity_registry(self) -> EntityRegistry:
+    """
+    Returns the registry of the NPCs and items at the sites of every land in memory, building it if it is missing
+    """
+    if self.entities is None:
+      self.entities = EntityRegistry()
+      for land in self.lands:
+        if not isinstance(land, ShardProxy):  # Lands register themselves as they are loaded
+          self.entities.register_land(land)
+    return self.entities
+
+  def enable_stat_store(self) -> NPCStats:
+    """
+    Moves the stats of every NPC in memory into a columnar stat store for bulk updates, which NPCs in lands loaded later join as they load
+    """
+    if self.stats is None:
+      self.stats = NPCStats(self)
+      for land in self.lands:
+        if not isinstance(land, ShardProxy):
+          self.stats.attach_land(land)
+      self.__changed()
+    return self.stats
+
+  def connect(self, source: Union["Site", str], target: Union["Site", str], weight: float=1.0, both_ways: bool=True) -> None:
+    """
+    Connects two sites (or site paths) for travel, in both directions unless stated otherwise
+    """
+    self.__route_map().connect(self.__node(source), self.__node(target), weight, both_ways)
+    self.__changed()
+
+  def disconnect(self, source: Union["Site", str], target: Union["Site", str], both_ways: bool=True) -> None:
+    """
+    Removes the connection between two sites (or site paths), in both directions unless stated otherwise
+    """
+    self.__route_map().disconnect(self.__node(source), self.__node(target), both_ways)
+    self.__changed()
+
+  def neighbours(self, site: Union["Site", str]) -> List["Site"]:
+    """
+    Returns the sites directly reachable from a site, such as for a travel menu
+    """
+    return [self.resolve(node) for node in self.__route_map().neighbours(self.__node(site))]
+
+  def route(self, source: Union["Site", str], target: Union["Site", str]) -> List["Site"]:
     """
-    return list(filter(lambda land: land.name == name, self.lands))[0]
-  
+    Returns the sites along the shortest route between two sites, including both
+    """
+    route = self.__route_map().route(self.__node(source), self.__node(target))
+    if route is None:
+      raise RouteNotFoundError(f"There is no route from {self.__node(source)!r} to {self.__node(target)!r}") from None
+    return [self.resolve(node) for node in route]
+
+  def step_npcs_towards(self, npcs: Iterable["NPC"], target: Union["Site", str], steps: int=1) -> int:
+    """
+    Moves every NPC that can move automatically up to a number of sites along its shortest route to a target, from a single search, and returns how many moved
+    """
+    next_hops = self.__route_map().next_hops(self.__node(target))
+    sites = {}
+    moved = 0
+    for npc in npcs:
+      if not npc.can_move_automatically:
+        continue
+      start = node = npc.current_site.path
+      for _ in range(steps):
+        node = next_hops.get(node, node)  # NPCs at the target, or with no route to it, stay where they are
+      if node != start:
+        if node not in sites:
+          sites[node] = self.resolve(node)
+        npc.move_to(sites[node])
+        moved += 1
+    return moved
+
+  def __setstate__(self, state: Dict[str, object]) -> None:
+    """
+    Restores this world object, registering the entities of any lands restored along with it rather than from their own shards
+    """
+    self.__dict__.update(state)
+    if self.stats is not None:
+      for land in self.lands:
+        if not isinstance(land, ShardProxy):
+          self.stats.attach_land(land)
+    if self.entities is not None:
+      for land in self.lands:
+        if not isinstance(land, ShardProxy):
+          self.entities.register_land(land)
+
   def __str__(self) -> str:
     """
     String representation of this land object
     """
     return self.name
-  
+
   def __repr__(self) -> str:
     """
     General representation of this land object
     """
     return f"{self.name} {{{list(self.lands.values())}}}"
-  
+
   def add_land(self, land: Land) -> None:
     """
     Adds a land object into this world object
     """
     self.lands.append(land)
+    self.__land_index().setdefault(land.shard_key(), len(self.lands) - 1)  # Lookups return the first land added with a name
+    self.__changed()
 
   def add_game(self, game: AdventureGame) -> None:
     """
@@ -43,3 +183,46 @@ class World:
     self.game = game
     for land in self.lands:
       land.add_game(self.game)
+
+  def __changed(self) -> None:
+    """
+    A mangled helper method to flag the world as changed in its game's next save, after a change the game cannot see
+    """
+    if self.game is not None:
+      self.game.mark_changed(self)
+
+  def __land_index(self) -> Dict[str, int]:
+    """
+    A mangled helper method to return the index of land names, building it if it is missing
+    """
+    if self.land_indexes is None:
+      self.land_indexes = {}
+      for idx, land in enumerate(self.lands):
+        self.land_indexes.setdefault(land.shard_key(), idx)  # Shard keys are known without loading
+    return self.land_indexes
+
+  def __route_map(self) -> RouteMap:
+    """
+    A mangled helper method to return the connections between sites, creating them if they are missing
+    """
+    if self.routes is None:
+      self.routes = RouteMap()
+    return self.routes
+
+  @staticmethod
+  def __node(location: Union["Site", str]) -> str:
+    """
+    A mangled helper method to return the path of a site, which is how sites are keyed in the connections between them
+    """
+    return location if isinstance(location, str) else location.path
+
+  @staticmethod
+  @functools.lru_cache(maxsize=1024)
+  def __compile_path(path: str) -> Tuple[str, ...]:
+    """
+    A mangled helper method to split a location path into the names of its land, area and site, once per distinct path
+    """
+    names = tuple(path.strip("/").split("/"))
+    if not 1 <= len(names) <= 3 or not all(names):
+      raise ValueError(f"{path!r} is not a valid location path, which must be of the form 'Land', 'Land/Area' or 'Land/Area/Site'") from None
+    return names
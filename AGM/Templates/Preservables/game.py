@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 
 from AGM.Tools.Preservation.preservable import Preservable
 from AGM.Tools.ConsoleControl.console import Console
@@ -15,6 +15,9 @@ class AdventureGame(Preservable):
   """
   A preservable implementation of the game class
   """
+  daily_snapshots = False  # Whether a rolling backup is taken at the start of each in-game day, which child classes can opt into
+  snapshot_retention = 7  # The number of daily snapshots kept as rolling backups
+
   def __init__(self, name: str, path: str, user: User, player: Player, world: World, tutorial: Optional[Tutorial]=None) -> None:
     self.day = 1
     self.name = name
@@ -34,6 +37,18 @@ class AdventureGame(Preservable):
     """
     return f"Game Save - {self.save_name} (Day {self.day})"
 
+  def save_metadata(self) -> Dict[str, Any]:
+    """
+    Extends the catalogued save metadata with the game's owner and day
+    """
+    return {**super().save_metadata(), "owner": self.user.username, "name": self.name, "day": self.day}
+
+  def snapshot(self, day: Optional[int]=None) -> int:
+    """
+    Stores a deduplicated backup of the game, keyed by the current in-game day unless another day is given
+    """
+    return super().snapshot(self.day if day is None else day)
+
   def run(self) -> None:
     """
     The game loop which runs and manages the game
@@ -44,11 +59,13 @@ class AdventureGame(Preservable):
       if self.tutorial is not None:
         if self.tutorial.is_triggered(self):
           self.tutorial.run_stage(self)
+          self.mark_dirty("tutorial")  # Stages advance the tutorial in-place
 
       self.player.do_action()
       self.user.update_achievements(self)
       
-      self.save()
+      Console.flush()  # What the action printed is shown before saving, rather than after
+      self.save()  # Only the parts reported as changed are journaled, while changes within lands are saved with their shards
       self.user.save()
 
   def add_killed_npc(self, npc: NPC) -> None:
@@ -56,6 +73,17 @@ class AdventureGame(Preservable):
     Adds an NPC to the dead-NPC respawn queue, to register NPC deaths and hence respawns
     """
     self.killed_npcs.append((npc, self.day))
+    self.mark_dirty("killed_npcs")
+
+  def mark_changed(self, part: Any) -> None:
+    """
+    Flags whichever attribute holds a part of the game (such as its player or world) as changed for the next save, ignoring changes made while the game is being set up
+    """
+    if "_Preservable__dirty_attributes" not in self.__dict__:
+      return
+    for attribute_name in ("player", "world", "tutorial"):
+      if self.__dict__.get(attribute_name) is part:
+        self.mark_dirty(attribute_name)
   
   def next_day(self) -> None:
     """
@@ -65,4 +93,8 @@ class AdventureGame(Preservable):
     self.player.reset_todays_destinations()
     for npc_data in filter(lambda data: self.day - data[1] == data[0].respawn_after_days, self.killed_npcs):
       self.killed_npcs.remove(npc_data)
+      self.mark_dirty("killed_npcs")
       npc_data[0].respawn()
+    if self.daily_snapshots:
+      self.snapshot()
+      self.prune_snapshots(keep_latest=self.snapshot_retention)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any
 
 from AGM.Tools.Preservation.preservable import Preservable
 
@@ -18,6 +18,12 @@ class User(Preservable):
     
     super().__init__(self.username, save_file, save_password=password)
 
+  def save_metadata(self) -> Dict[str, Any]:
+    """
+    Extends the catalogued save metadata with the user's username and achievement progress
+    """
+    return {**super().save_metadata(), "owner": self.username, "achievements_completed": len([achievement for achievement in self.achievements if achievement.is_completed])}
+
   def update_achievements(self, game: AdventureGame) -> None:
     """
     Update the user's achievements status
@@ -26,3 +32,4 @@ class User(Preservable):
       if achievement.is_triggered(game) and not achievement.is_completed:
         achievement.achieve()
         achievement.notify()
+        self.mark_dirty("achievements")
@@ -0,0 +1,213 @@
+"""
+Pluggable I/O backends, so that games can be driven by the terminal, a script or a test harness alike
+"""
+
+
+from __future__ import annotations
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from abc import ABC, abstractmethod
+from collections import deque
+import contextlib
+import atexit
+import shutil
+import sys
+
+from .keyboard import KeyboardSession, KeyDecoder, KeyEvent
+from .screen import Screen
+
+
+class IOBackend(ABC):
+  """
+  The abstract interface through which all console input and output passes, along with the currently active backend
+  """
+  active: Optional[IOBackend] = None
+
+  def __init__(self, renders: bool=True) -> None:
+    self.renders = renders  # Whether output is written at all, as bots and load tests have no use for it
+    self.screen = Screen(self)
+
+  @classmethod
+  def get(cls) -> IOBackend:
+    """
+    Returns the active backend, defaulting to the terminal
+    """
+    if IOBackend.active is None:
+      IOBackend.active = TerminalBackend()
+    return IOBackend.active
+
+  @classmethod
+  def set(cls, backend: IOBackend) -> None:
+    """
+    Makes a backend the active backend for all console input and output
+    """
+    IOBackend.active = backend
+
+  @classmethod
+  @contextlib.contextmanager
+  def using(cls, backend: IOBackend) -> Iterator[IOBackend]:
+    """
+    A context manager to make a backend active for its duration, restoring the previous backend afterwards
+    """
+    previous, IOBackend.active = IOBackend.active, backend
+    try:
+      yield backend
+    finally:
+      IOBackend.active = previous
+
+  def session(self) -> contextlib.AbstractContextManager:
+    """
+    Returns a context manager that prepares the backend to read keystrokes for its duration
+    """
+    return contextlib.nullcontext(self)
+
+  def read_event(self, timeout: Optional[float]=None) -> Optional[KeyEvent]:
+    """
+    Writes any printed text still held back, so that it is seen before waiting on input, and returns the next keystroke, waiting up to the timeout (or indefinitely) for one
+    """
+    self.screen.flush()
+    return self.next_event(timeout)
+
+  @abstractmethod
+  def next_event(self, timeout: Optional[float]=None) -> Optional[KeyEvent]:
+    """
+    Returns the next keystroke from the backend's input, waiting up to the timeout (or indefinitely) for one
+    """
+
+  @abstractmethod
+  def has_pending(self) -> bool:
+    """
+    Whether keystrokes are already waiting to be read
+    """
+
+  @abstractmethod
+  def write(self, text: str) -> None:
+    """
+    Writes text to the output in one write
+    """
+
+  @abstractmethod
+  def terminal_size(self) -> Tuple[int, int]:
+    """
+    Returns the number of columns and lines of the output
+    """
+
+
+class TerminalBackend(IOBackend):
+  """
+  An I/O backend for an interactive terminal, reading through a keyboard session and writing to standard output
+  """
+  def __init__(self, file_descriptor: Optional[int]=None, stream=None, renders: bool=True) -> None:
+    self.keyboard = KeyboardSession(file_descriptor)
+    self.stream = stream
+    super().__init__(renders=renders)
+    atexit.register(self.screen.flush)  # Printed text is never lost by exiting before the next frame
+
+  def session(self) -> KeyboardSession:
+    """
+    Returns the keyboard session, which keeps the terminal in cbreak mode for its duration
+    """
+    return self.keyboard
+
+  def next_event(self, timeout: Optional[float]=None) -> Optional[KeyEvent]:
+    """
+    Returns the next keystroke typed at the terminal, waiting up to the timeout (or indefinitely) for one
+    """
+    with self.keyboard:
+      return self.keyboard.read_event(timeout)
+
+  def has_pending(self) -> bool:
+    """
+    Whether keystrokes have already been read from the terminal but not yet consumed
+    """
+    return bool(self.keyboard.events)
+
+  def write(self, text: str) -> None:
+    """
+    Writes text to standard output in one write, and flushes it
+    """
+    if self.renders and text:
+      stream = sys.stdout if self.stream is None else self.stream  # Looked up on each write, so redirections of sys.stdout are followed
+      stream.write(text)
+      stream.flush()
+
+  def terminal_size(self) -> Tuple[int, int]:
+    """
+    Returns the number of columns and lines of the terminal
+    """
+    return tuple(shutil.get_terminal_size())
+
+
+class MemoryBackend(IOBackend):
+  """
+  An I/O backend with no terminal attached, which reads from a scripted queue of keystrokes and captures everything written
+  """
+  def __init__(self, keys: Union[str, Iterable[KeyEvent]]="", columns: int=80, lines: int=24, renders: bool=True) -> None:
+    self.events: Deque[KeyEvent] = deque()
+    self.columns = columns
+    self.lines = lines
+    self.__decoder = KeyDecoder()
+    self.__output: List[str] = []
+    super().__init__(renders=renders)
+    self.feed(keys)
+
+  def feed(self, keys: Union[str, Iterable[KeyEvent]]) -> None:
+    """
+    Queues keystrokes to be read, either from text (decoded as if typed, including escape sequences) or as key events
+    """
+    if isinstance(keys, str):
+      self.events.extend(self.__decoder.feed(keys.encode()))
+      self.events.extend(self.__decoder.flush())
+    else:
+      self.events.extend(keys)
+
+  def type_line(self, line: str) -> None:
+    """
+    Queues a line of text followed by the enter key
+    """
+    self.feed(f"{line}\n")
+
+  def next_event(self, timeout: Optional[float]=None) -> Optional[KeyEvent]:
+    """
+    Returns the next scripted keystroke, raising an error once the script runs out rather than waiting forever
+    """
+    if not self.events:
+      if timeout is not None:
+        return None
+      raise EOFError("The scripted input ran out") from None
+    return self.events.popleft()
+
+  def has_pending(self) -> bool:
+    """
+    Whether scripted keystrokes remain to be read
+    """
+    return bool(self.events)
+
+  def write(self, text: str) -> None:
+    """
+    Captures written text in the output buffer
+    """
+    if self.renders and text:
+      self.__output.append(text)
+
+  @property
+  def output(self) -> str:
+    """
+    Everything written since the output buffer was last cleared
+    """
+    output = "".join(self.__output)
+    self.__output = [output]
+    return output
+
+  def clear_output(self) -> str:
+    """
+    Empties the output buffer, and returns what it held
+    """
+    output, self.__output = "".join(self.__output), []
+    return output
+
+  def terminal_size(self) -> Tuple[int, int]:
+    """
+    Returns the configured number of columns and lines
+    """
+    return self.columns, self.lines
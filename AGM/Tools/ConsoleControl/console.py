@@ -6,13 +6,10 @@ A collection of tools relating to console manipulation
 from typing import Callable, Optional
 
 import functools
-import termios
-import tty
-import sys
-import os
-import string
 
-from .cursor import Cursor
+from .keyboard import KeyEvent
+from .screen import Frame
+from .backends import IOBackend
 
 
 class Console:
@@ -24,11 +21,14 @@ class Console:
     """
     Waits for input, and returns the first key pressed after being called as a string
     """
-    file_descriptors = termios.tcgetattr(sys.stdin)  # Store the original file descriptors
-    tty.setcbreak(sys.stdin)  # Sets the console to cbreak (rare) mode, to deal with single character input
-    key = sys.stdin.read(1)[0]  # Hangs until a key is pressed
-    termios.tcsetattr(sys.stdin, termios.TCSADRAIN, file_descriptors)  # Reset the console mode back to its original state
-    return key
+    return Console.get_key_event().character
+
+  @staticmethod
+  def get_key_event() -> KeyEvent:
+    """
+    Waits for input, and returns the next decoded keystroke, including special keys such as the arrow keys
+    """
+    return IOBackend.get().read_event()
 
   @staticmethod
   def clear(method: Callable) -> Callable:
@@ -46,7 +46,14 @@ class Console:
     """
     Clear the console
     """
-    os.system("clear")  # Clear the console
+    IOBackend.get().screen.clear()  # In-process, rather than starting a 'clear' subprocess
+  
+  @staticmethod
+  def flush() -> None:
+    """
+    Writes any printed text still held back for the next frame or prompt, such as before slow work
+    """
+    IOBackend.get().screen.flush()
   
   @staticmethod
   def get_input(*args, cover_character: Optional[str]=None, end: str="", sep: str=" ", input_zone: bool=False) -> str:
@@ -57,34 +64,35 @@ class Console:
     original_cover_character = cover_character
     raw_input = []  # The actual user input
     cover_characters = []  # The printed list of characters
-    print(msg, "\n\nInput:\t" if input_zone else "", end=end, flush=True)
+    prompt = msg + (" \n\nInput:\t" if input_zone else " ") + end
+    backend = IOBackend.get()
+    screen = backend.screen
+    screen.render(Frame(prompt))
 
-    while True:
-      current_character = Console.get_key()
-      if original_cover_character is None:
-        cover_character = current_character
+    with backend.session():  # A terminal stays in cbreak mode for the whole input, so fast typing and pastes are kept
+      while True:
+        event = backend.read_event()
+        if original_cover_character is None:
+          cover_character = event.character
 
-      if ord(current_character) == 10:  # Enter
-        break
-      elif ord(current_character) == 127:  # Backspace
-        try:
-          del raw_input[-1]
-          del cover_characters[-1]
-        except IndexError:  # No characters left to delete
+        if event.name == "enter":
+          break
+        elif event.name == "backspace":
+          try:
+            del raw_input[-1]
+            del cover_characters[-1]
+          except IndexError:  # No characters left to delete
+            continue
+        elif event.name == "tab":
+          cover_characters.append(cover_character)
+          raw_input.append("\t")
+        elif not event.is_character or not event.character.isprintable():  # Not a recognized character (including special keys)
           continue
-      elif ord(current_character) == 9:  # Tab
-        cover_characters.append(cover_character)
-        raw_input.append("\t")
-      elif ord(current_character) == 32:  # Space
-        cover_characters.append(cover_character)
-        raw_input.append(" ")
-      elif current_character not in string.printable:  # Not a recognized character
-        continue
-      else:  # A non-special, recognized character
-        cover_characters.append(cover_character)
-        raw_input.append(current_character)
-      Cursor.clear_line()
-      Cursor.carriage_return()
-      print("Input:\t" if input_zone else msg.split("\n")[-1], "".join(cover_characters), end="", flush=True)  # Re-print the final line of the covered input
-    print()  # Print a newline (\n) character to finish for formatting purposes only
+        else:  # A non-special, recognized character
+          cover_characters.append(cover_character)
+          raw_input.append(event.character)
+        if not backend.has_pending():  # Redraw once per batch of typed or pasted keys, writing only the changed characters
+          screen.render(Frame(prompt).extend("".join(cover_characters)))
+    screen.render(Frame(prompt).extend("".join(cover_characters)))
+    screen.release()  # Finish on a new line for formatting purposes only
     return "".join(raw_input)
@@ -0,0 +1,190 @@
+"""
+A persistent keyboard session, which reads and decodes keystrokes from the console in bulk
+"""
+
+
+from __future__ import annotations
+from typing import Deque, List, Optional
+
+from collections import deque
+import codecs
+import select
+import termios
+import tty
+import sys
+import os
+
+
+class KeyEvent:
+  """
+  A simple wrapper to contain all the necessary data for a single decoded keystroke
+  """
+  def __init__(self, name: str, character: str="") -> None:
+    self.name = name  # Either 'character' for printable input, or the name of a special key such as 'enter' or 'up'
+    self.character = character
+
+  @property
+  def is_character(self) -> bool:
+    """
+    Whether this keystroke is printable text rather than a special key
+    """
+    return self.name == "character"
+
+  def __eq__(self, other: object) -> bool:
+    """
+    Compares keystrokes by their name and character
+    """
+    return isinstance(other, KeyEvent) and (self.name, self.character) == (other.name, other.character)
+
+  def __repr__(self) -> str:
+    """
+    A representation of the keystroke, for debugging purposes
+    """
+    return f"KeyEvent({self.name!r}, {self.character!r})"
+
+
+class KeyDecoder:
+  """
+  An incremental decoder from raw console bytes to keystrokes, handling multi-byte UTF-8 and ANSI escape sequences
+  """
+  CONTROL_KEYS = {"\n": "enter", "\r": "enter", "\t": "tab", "\x7f": "backspace", "\x08": "backspace", "\x1b": "escape"}
+  CSI_KEYS = {"A": "up", "B": "down", "C": "right", "D": "left", "H": "home", "F": "end", "Z": "shift_tab", "P": "f1", "Q": "f2", "R": "f3", "S": "f4"}
+  TILDE_KEYS = {
+    "1": "home", "2": "insert", "3": "delete", "4": "end", "5": "page_up", "6": "page_down", "7": "home", "8": "end",
+    "11": "f1", "12": "f2", "13": "f3", "14": "f4", "15": "f5", "17": "f6", "18": "f7", "19": "f8", "20": "f9", "21": "f10", "23": "f11", "24": "f12"
+  }
+
+  def __init__(self) -> None:
+    self.__decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    self.__pending = ""  # Decoded text that may be the start of an unfinished escape sequence
+
+  def feed(self, data: bytes) -> List[KeyEvent]:
+    """
+    Decodes newly read bytes into every keystroke they complete, holding back any incomplete sequence until more bytes arrive
+    """
+    self.__pending += self.__decoder.decode(data)
+    events = []
+    idx = 0
+    while idx < len(self.__pending):
+      event, length = self.__decode_one(self.__pending, idx)
+      if event is None:  # Incomplete escape sequence
+        break
+      events.append(event)
+      idx += length
+    self.__pending = self.__pending[idx:]
+    return events
+
+  def flush(self) -> List[KeyEvent]:
+    """
+    Decodes anything held back as literal keystrokes, for when no more bytes arrive to complete an escape sequence
+    """
+    pending, self.__pending = self.__pending, ""
+    if not pending:
+      return []
+    return [KeyEvent("escape", "\x1b")] + self.feed(pending[1:].encode()) if pending.startswith("\x1b") else self.feed(pending.encode())
+
+  @property
+  def has_pending(self) -> bool:
+    """
+    Whether an incomplete escape sequence is being held back
+    """
+    return bool(self.__pending)
+
+  def __decode_one(self, text: str, idx: int) -> tuple:
+    """
+    A mangled helper method to decode the keystroke starting at an index, returning it and its length, or None if it is incomplete
+    """
+    character = text[idx]
+    if character != "\x1b":
+      if character in self.CONTROL_KEYS:
+        return KeyEvent(self.CONTROL_KEYS.get(character), character), 1
+      if ord(character) < 32:
+        return KeyEvent(f"ctrl_{chr(ord(character) + 96)}", character), 1
+      return KeyEvent("character", character), 1
+
+    if idx + 1 >= len(text):
+      return None, 0
+    introducer = text[idx + 1]
+    if introducer == "O":  # SS3 sequences, sent for F1-F4 and by terminals in application cursor mode
+      if idx + 2 >= len(text):
+        return None, 0
+      return KeyEvent(self.CSI_KEYS.get(text[idx + 2], "unknown"), text[idx:idx + 3]), 3
+    if introducer != "[":  # Alt + key
+      return KeyEvent("alt", introducer), 2
+
+    end = idx + 2
+    while end < len(text) and not "\x40" <= text[end] <= "\x7e":
+      end += 1
+    if end >= len(text):
+      return None, 0
+    sequence = text[idx:end + 1]
+    parameters, final = text[idx + 2:end], text[end]
+    if final == "~":
+      return KeyEvent(self.TILDE_KEYS.get(parameters.split(";")[0], "unknown"), sequence), len(sequence)
+    return KeyEvent(self.CSI_KEYS.get(final, "unknown"), sequence), len(sequence)
+
+
+class KeyboardSession:
+  """
+  A context manager that keeps the console in cbreak mode for its duration, reading every available byte at once and buffering the decoded keystrokes
+  """
+  ESCAPE_TIMEOUT = 0.05  # How long to wait for the rest of an escape sequence before treating it as the escape key
+  events: Deque[KeyEvent] = deque()  # Shared between sessions, so keys typed ahead of a read are never dropped
+  decoder = KeyDecoder()
+  depth = 0
+  original_attributes = None
+
+  def __init__(self, file_descriptor: Optional[int]=None) -> None:
+    self.file_descriptor = sys.stdin.fileno() if file_descriptor is None else file_descriptor
+
+  def __enter__(self) -> KeyboardSession:
+    """
+    Switches the console into cbreak mode, unless an enclosing session already has
+    """
+    if KeyboardSession.depth == 0 and os.isatty(self.file_descriptor):
+      KeyboardSession.original_attributes = termios.tcgetattr(self.file_descriptor)
+      tty.setcbreak(self.file_descriptor)
+    KeyboardSession.depth += 1
+    return self
+
+  def __exit__(self, *exception_info) -> None:
+    """
+    Restores the console's original mode once the outermost session ends
+    """
+    KeyboardSession.depth -= 1
+    if KeyboardSession.depth == 0 and KeyboardSession.original_attributes is not None:
+      termios.tcsetattr(self.file_descriptor, termios.TCSADRAIN, KeyboardSession.original_attributes)
+      KeyboardSession.original_attributes = None
+
+  def read_event(self, timeout: Optional[float]=None) -> Optional[KeyEvent]:
+    """
+    Returns the next keystroke, waiting up to the timeout (or indefinitely) for one to be typed
+    """
+    while not self.events:
+      if not self.__fill(timeout):
+        return None
+    return self.events.popleft()
+
+  def pending_events(self) -> List[KeyEvent]:
+    """
+    Returns and consumes every keystroke that has already been typed, without waiting
+    """
+    self.__fill(0)
+    events = list(self.events)
+    self.events.clear()
+    return events
+
+  def __fill(self, timeout: Optional[float]) -> bool:
+    """
+    A mangled helper method to read every available byte in one call and decode it, returning whether anything could be read before the timeout
+    """
+    readable, _, _ = select.select([self.file_descriptor], [], [], timeout)
+    if not readable:
+      return False
+    data = os.read(self.file_descriptor, 4096)
+    if not data:
+      raise EOFError("The console input was closed") from None
+    self.events.extend(self.decoder.feed(data))
+    if self.decoder.has_pending and not select.select([self.file_descriptor], [], [], self.ESCAPE_TIMEOUT)[0]:
+      self.events.extend(self.decoder.flush())  # A lone escape key press, rather than the start of a sequence
+    return True
@@ -0,0 +1,139 @@
+"""
+A text-layout engine, which measures, wraps and truncates text by its visible width on the console
+"""
+
+
+from typing import List, Tuple, TypeVar, Union
+
+import functools
+import unicodedata
+import re
+
+from .styled import StyledText
+
+
+ESCAPE_CODE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+ESCAPE_CODE_SPLIT = re.compile(r"(\x1b\[[0-9;?]*[A-Za-z])")
+TextLike = TypeVar("TextLike", str, StyledText)
+
+
+class Layout:
+  """
+  A static class containing functionality to lay text out by its visible width, ignoring escape codes and accounting for wide and combining characters
+  """
+  @staticmethod
+  @functools.lru_cache(maxsize=4096)
+  def character_width(character: str) -> int:
+    """
+    Returns the number of console columns a single character takes up
+    """
+    if unicodedata.combining(character) or unicodedata.category(character) in ("Mn", "Me", "Cf", "Cc"):
+      return 0  # Combining marks, zero-width joiners and control characters take up no columns of their own
+    return 2 if unicodedata.east_asian_width(character) in ("W", "F") else 1
+
+  @staticmethod
+  def width(text: Union[str, StyledText]) -> int:
+    """
+    Returns the visible width of text on the console, ignoring any escape codes
+    """
+    plain = text.plain if isinstance(text, StyledText) else ESCAPE_CODE.sub("", text)
+    if plain.isascii() and plain.isprintable():  # Fast path, where every character is one column
+      return len(plain)
+    return sum(map(Layout.character_width, plain))
+
+  @staticmethod
+  @functools.lru_cache(maxsize=1024)
+  def wrap(text: TextLike, width: int) -> Tuple[TextLike, ...]:
+    """
+    Word-wraps text into rows that fit within a width, breaking words only if they are wider than a row, and keeping the styling of every row intact
+    """
+    if width < 1:
+      raise ValueError(f"Text cannot be wrapped to a width of {width}") from None
+    if "\n" not in (text.plain if isinstance(text, StyledText) else text) and Layout.width(text) <= width:
+      return (text,)
+    styled = StyledText.parse(text)
+    rows = []
+    offset = 0
+    for paragraph in styled.plain.split("\n"):
+      rows.extend(styled[offset + start:offset + end] for start, end in Layout.__wrap_plain(paragraph, width))
+      offset += len(paragraph) + 1
+    return tuple(rows) if isinstance(text, StyledText) else tuple(row.render(color=True) for row in rows)
+
+  @staticmethod
+  @functools.lru_cache(maxsize=1024)
+  def truncate(text: TextLike, width: int, ellipsis: str="…") -> TextLike:
+    """
+    Shortens text to fit within a width, ending it with an ellipsis if anything was cut, and keeping its styling intact
+    """
+    if Layout.width(text) <= width:
+      return text
+    styled = StyledText.parse(text)
+    end = Layout.__fitting_end(styled.plain, 0, max(width - Layout.width(ellipsis), 0))
+    truncated = styled[:end] + ellipsis if width >= Layout.width(ellipsis) else styled[:Layout.__fitting_end(styled.plain, 0, width)]
+    return truncated if isinstance(text, StyledText) else truncated.render(color=True)
+
+  @staticmethod
+  def expand_tabs(text: str, tab_size: int=8) -> str:
+    """
+    Replaces tabs with the spaces that reach the next tab stop, measuring columns by visible width
+    """
+    if "\t" not in text:
+      return text
+    expanded = []
+    column = 0
+    for part in ESCAPE_CODE_SPLIT.split(text):
+      if part.startswith("\x1b"):
+        expanded.append(part)
+        continue
+      for character in part:
+        if character == "\t":
+          expanded.append(" " * (tab_size - column % tab_size))
+          column += tab_size - column % tab_size
+        else:
+          expanded.append(character)
+          column += Layout.character_width(character)
+    return "".join(expanded)
+
+  @staticmethod
+  def clear_cache() -> None:
+    """
+    Empties the layout caches
+    """
+    Layout.wrap.cache_clear()
+    Layout.truncate.cache_clear()
+
+  @staticmethod
+  def __fitting_end(plain: str, start: int, width: int) -> int:
+    """
+    A mangled helper method to find the end of the longest run of characters from a start index that fits within a width
+    """
+    total = 0
+    end = start
+    while end < len(plain):
+      character_width = Layout.character_width(plain[end])
+      if total + character_width > width:
+        break
+      total += character_width
+      end += 1
+    return end
+
+  @staticmethod
+  def __wrap_plain(paragraph: str, width: int) -> List[Tuple[int, int]]:
+    """
+    A mangled helper method to find the (start, end) character indexes of each wrapped row of a single paragraph
+    """
+    rows = []
+    start = 0
+    while True:
+      end = Layout.__fitting_end(paragraph, start, width)
+      if end >= len(paragraph):
+        rows.append((start, len(paragraph)))
+        return rows
+      space = paragraph.rfind(" ", start, end + 1)  # The character that did not fit may itself be the space to break at
+      if space > start:
+        rows.append((start, space))
+        start = space + 1  # The space that was broken at is not carried onto the next row
+      else:  # A single word wider than a row
+        end = max(end, start + 1)
+        rows.append((start, end))
+        start = end
@@ -0,0 +1,282 @@
+"""
+A double-buffered screen renderer, which redraws only the parts of the console that changed between frames
+"""
+
+
+from __future__ import annotations
+from typing import Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import contextlib
+import re
+
+from .layout import Layout
+
+if TYPE_CHECKING:
+  from .backends import IOBackend
+
+
+ESCAPE_CODE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"  # Home the cursor, then clear the screen and its scrollback
+END = "\033[0m"
+
+
+class Frame:
+  """
+  An in-memory composition of a region of the console, which is drawn by a screen in one write
+  """
+  def __init__(self, *lines: str, cursor: Optional[Tuple[int, int]]=None) -> None:
+    self.lines: List[str] = []
+    self.cursor = cursor  # Where to leave the cursor once drawn (in rows after wrapping), or the end of the last row if None
+    for line in lines:
+      self.add(line)
+
+  def add(self, text: str) -> Frame:
+    """
+    Adds text to the frame, starting a new row for each line of the text
+    """
+    self.lines.extend(str(text).split("\n"))
+    return self
+
+  def extend(self, text: str) -> Frame:
+    """
+    Appends text to the end of the frame's last row, continuing onto new rows for any further lines of the text
+    """
+    first, *rest = str(text).split("\n")
+    if self.lines:
+      self.lines[-1] += first
+    else:
+      self.lines.append(first)
+    self.lines.extend(rest)
+    return self
+
+  def __len__(self) -> int:
+    """
+    Returns the number of rows in the frame
+    """
+    return len(self.lines)
+
+
+class Screen:
+  """
+  A renderer that diffs each frame against the previous one, and writes only the changed cells to its backend in a single write
+  """
+  def __init__(self, backend: IOBackend) -> None:
+    self.backend = backend
+    self.__rows: List[str] = []  # The source text of each drawn row, so unchanged rows are skipped without comparing cells
+    self.__cells: List[List[Tuple[str, str]]] = []  # The (style, character) cells of each drawn row
+    self.__cursor = (0, 0)  # Relative to the top of the region being drawn
+    self.__height = 1  # The number of rows of the region that exist on the console, as rows below must be scrolled into existence
+    self.__pending: List[str] = []  # Printed text, held back until the next frame or flush so that it is written in one go
+
+  @staticmethod
+  def cells(line: str) -> List[Tuple[str, str]]:
+    """
+    Splits a line into (style, character) cells for each column, tracking the escape codes active at each character and expanding tabs
+    """
+    cells = []
+    style = ""
+    idx = 0
+    for match in ESCAPE_CODE.finditer(line + "\x1b[m"):
+      for character in line[idx:match.start()]:
+        if character == "\t":
+          cells.extend((style, " ") for _ in range(8 - len(cells) % 8))
+          continue
+        character_width = Layout.character_width(character)
+        if character_width == 0 and cells:  # Combining characters are drawn as part of the cell before them
+          cells[-1] = (cells[-1][0], cells[-1][1] + character)
+          continue
+        cells.append((style, character))
+        if character_width == 2:
+          cells.append((style, ""))  # The second column of a wide character, which is drawn along with it
+      code = match.group()
+      if code.endswith("m"):  # Only styles are kept, as any other escape code would move the cursor behind the screen's back
+        style = "" if code in ("\x1b[0m", "\x1b[m") else style + code
+      idx = match.end()
+    return cells
+
+  def render(self, frame: Frame) -> None:
+    """
+    Draws a frame over the region drawn by the previous frame, writing only the cells that differ
+    """
+    if not self.backend.renders:  # Nothing would be written, so the frame is not even compared
+      self.__pending.clear()
+      return
+    output = self.__pending
+    self.__pending = []
+    columns, lines = self.backend.terminal_size()
+    frame_rows = [row for line in frame.lines for row in Layout.wrap(Layout.expand_tabs(line), columns)]  # Wrapped here, so rows never wrap behind the screen's back
+    visible_from = len(self.__rows) - lines  # Rows scrolled out of view can no longer be redrawn
+    for row, line in enumerate(frame_rows):
+      if row < len(self.__rows) and self.__rows[row] == line:
+        continue
+      new_cells = self.cells(line)
+      old_cells = self.__cells[row] if row < len(self.__rows) else []
+      if row < visible_from:
+        self.__rows[row], self.__cells[row] = line, new_cells
+        continue
+      self.__draw_row(output, row, old_cells, new_cells)
+      if row < len(self.__rows):
+        self.__rows[row], self.__cells[row] = line, new_cells
+      else:
+        self.__rows.append(line)
+        self.__cells.append(new_cells)
+
+    for row in range(len(frame_rows), len(self.__rows)):  # Blank out rows the previous frame drew beyond this one
+      if self.__rows[row]:
+        self.__move(output, row, 0)
+        output.append("\033[2K")
+    del self.__rows[len(frame_rows):], self.__cells[len(frame_rows):]
+
+    cursor = frame.cursor
+    if cursor is None:
+      cursor = (max(len(frame_rows) - 1, 0), len(self.__cells[len(frame_rows) - 1]) if frame_rows else 0)
+    self.__move(output, *cursor)
+    self.write("".join(output))
+
+  def __draw_row(self, output: List[str], row: int, old_cells: List[Tuple[str, str]], new_cells: List[Tuple[str, str]]) -> None:
+    """
+    A mangled helper method to draw the runs of cells that changed within a single row
+    """
+    style = ""  # Styles are always reset after drawing, so the console starts each row unstyled
+    column = 0
+    while column < len(new_cells):
+      if column < len(old_cells) and old_cells[column] == new_cells[column]:
+        column += 1
+        continue
+      self.__move(output, row, column)
+      while column < len(new_cells) and (column >= len(old_cells) or old_cells[column] != new_cells[column]):
+        cell_style, character = new_cells[column]
+        if cell_style != style:
+          output.append(END + cell_style)
+          style = cell_style
+        output.append(character)
+        column += 1
+        while column < len(new_cells) and new_cells[column][1] == "":  # A wide character has already covered its second column
+          column += 1
+      self.__cursor = (row, column)
+    if style:
+      output.append(END)
+    if len(new_cells) < len(old_cells):
+      self.__move(output, row, len(new_cells))
+      output.append("\033[K")
+
+  def __move(self, output: List[str], row: int, column: int) -> None:
+    """
+    A mangled helper method to move the cursor relative to its tracked position, creating any rows below the region as needed
+    """
+    current_row, current_column = self.__cursor
+    if row > current_row:
+      existing_below = min(row, self.__height - 1) - current_row
+      if existing_below > 0:
+        output.append(f"\033[{existing_below}B")
+      if row - current_row - existing_below > 0:
+        output.append("\r\n" * (row - current_row - existing_below))  # New rows must be scrolled into existence
+        current_column = 0
+        self.__height = row + 1
+    elif row < current_row:
+      output.append(f"\033[{current_row - row}A")
+    if column != current_column:
+      output.append("\r" if column == 0 else (f"\033[{column - current_column}C" if column > current_column else f"\r\033[{column}C"))
+    self.__cursor = (row, column)
+
+  def write(self, text: str) -> None:
+    """
+    Writes raw text to the backend in a single write, along with any printed text still held back
+    """
+    if self.__pending:
+      text, self.__pending = "".join(self.__pending) + text, []
+    self.backend.write(text)
+
+  def print(self, text: str) -> None:
+    """
+    Queues text to be written below any region being drawn, which is left behind as it is, with the next frame or flush
+    """
+    if self.__rows:
+      self.__pending.extend(self.__release_output())
+      self.forget()
+    self.__pending.append(text)
+
+  def flush(self) -> None:
+    """
+    Writes any printed text that is still held back
+    """
+    self.write("")
+
+  def move_cursor(self, rows: int=0, columns: int=0) -> None:
+    """
+    Moves the cursor relative to its current position, keeping the screen's tracked position in step
+    """
+    row, column = self.__cursor
+    output = []
+    if rows < 0:
+      output.append(f"\033[{-rows}A")
+    elif rows > 0:
+      output.append(f"\033[{rows}B")
+    if columns < 0:
+      output.append(f"\033[{-columns}D")
+    elif columns > 0:
+      output.append(f"\033[{columns}C")
+    self.__cursor = (max(row + rows, 0), max(column + columns, 0))
+    self.write("".join(output))
+
+  def carriage_return(self) -> None:
+    """
+    Moves the cursor back to the start of its current row
+    """
+    self.__cursor = (self.__cursor[0], 0)
+    self.write("\r")
+
+  def clear_line(self) -> None:
+    """
+    Clears the row the cursor is on, so that the next frame redraws that row in full
+    """
+    row = self.__cursor[0]
+    if row < len(self.__rows):
+      self.__rows[row], self.__cells[row] = "\0", []  # Never equal to a real row
+    self.write("\033[2K")
+
+  def release(self) -> None:
+    """
+    Leaves the drawn region as it is, moving the cursor to a new line below it so that the next frame starts a new region
+    """
+    if self.__rows:
+      self.write("".join(self.__release_output()))
+    self.forget()
+
+  def __release_output(self) -> List[str]:
+    """
+    A mangled helper method to build the output that moves the cursor onto a new line below the drawn region
+    """
+    output = []
+    self.__move(output, len(self.__rows) - 1, len(self.__cells[-1]))
+    output.append("\r\n")
+    return output
+
+  def forget(self) -> None:
+    """
+    Discards the previous frame, so that the next frame is drawn in full from the cursor's current line
+    """
+    self.__rows = []
+    self.__cells = []
+    self.__cursor = (0, 0)
+    self.__height = 1
+
+  def clear(self) -> None:
+    """
+    Clears the console in-process, and starts a new region at the top of it
+    """
+    self.write(CLEAR_SCREEN)
+    self.forget()
+
+  @contextlib.contextmanager
+  def alternate_screen(self) -> Iterator[Screen]:
+    """
+    A context manager to draw on the console's alternate screen buffer, restoring the original screen and its scrollback afterwards
+    """
+    self.write("\033[?1049h\033[H")
+    self.forget()
+    try:
+      yield self
+    finally:
+      self.write("\033[?1049l")
+      self.forget()
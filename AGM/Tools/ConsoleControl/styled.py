@@ -0,0 +1,199 @@
+"""
+A styled-text value type made of spans, which is only converted into escape codes once, when rendered
+"""
+
+
+from __future__ import annotations
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+import os
+import re
+
+
+SGR_CODE = re.compile(r"\x1b\[([0-9;]*)m")
+END = "\033[0m"
+
+
+class StyledText:
+  """
+  An immutable sequence of (text, style) spans, where each style is a tuple of escape codes applied together
+  """
+  color_enabled = "NO_COLOR" not in os.environ  # See https://no-color.org
+  __slots__ = ("spans", "_StyledText__rendered", "_StyledText__plain")
+
+  def __init__(self, text: str="", *style: str) -> None:
+    self.spans: Tuple[Tuple[str, Tuple[str, ...]], ...] = ((text, tuple(style)),) if text else ()
+    self.__rendered = None
+    self.__plain = None
+
+  @classmethod
+  def from_spans(cls, spans: Iterable[Tuple[str, Tuple[str, ...]]]) -> StyledText:
+    """
+    Builds styled text from spans, merging neighbouring spans of the same style
+    """
+    merged = []
+    for text, style in spans:
+      if not text:
+        continue
+      if merged and merged[-1][1] == style:
+        merged[-1] = (merged[-1][0] + text, style)
+      else:
+        merged.append((text, tuple(style)))
+    styled = cls()
+    styled.spans = tuple(merged)
+    return styled
+
+  @classmethod
+  def parse(cls, string: Union[str, StyledText]) -> StyledText:
+    """
+    Converts a string containing escape codes (such as those from Text) into styled text
+    """
+    if isinstance(string, StyledText):
+      return string
+    spans = []
+    style = ()
+    idx = 0
+    for match in SGR_CODE.finditer(string):
+      spans.append((string[idx:match.start()], style))
+      style = () if match.group(1) in ("", "0") else style + (match.group(),)
+      idx = match.end()
+    spans.append((string[idx:], style))
+    return cls.from_spans(spans)
+
+  def styled(self, *style: str) -> StyledText:
+    """
+    Returns this text with more escape codes applied to every span, the equivalent of wrapping it in another Text call
+    """
+    return self.from_spans((text, span_style + tuple(code for code in style if code not in span_style)) for text, span_style in self.spans)
+
+  @property
+  def plain(self) -> str:
+    """
+    The text without any styling
+    """
+    if self.__plain is None:
+      self.__plain = "".join(text for text, _ in self.spans)
+    return self.__plain
+
+  def render(self, color: Optional[bool]=None) -> str:
+    """
+    Converts the text into a string with escape codes, once per text, with one reset at the end of each styled span
+    """
+    if not (self.color_enabled if color is None else color):  # Fast path, without touching any escape codes
+      return self.plain
+    if self.__rendered is None:
+      self.__rendered = "".join(f"{''.join(style)}{text}{END}" if style else text for text, style in self.spans)
+    return self.__rendered
+
+  def heading(self) -> StyledText:
+    """
+    Converts the text into a heading format, lower-casing articles other than the first and last word, without disturbing its styling
+    """
+    articles = ["the", "a", "an"]
+    words = self.plain.split(" ")
+    for idx, word in enumerate(words):
+      if word.lower() in articles and idx != 0 and idx != len(words) - 1:
+        words[idx] = word.lower()
+      else:
+        words[idx] = word[:1].upper() + word[1:].lower()
+    return self.__with_plain(" ".join(words), lambda text: text)
+
+  def title(self) -> StyledText:
+    """
+    Title-cases the text without disturbing its styling
+    """
+    return self.__with_plain(self.plain.title(), str.title)
+
+  def upper(self) -> StyledText:
+    """
+    Upper-cases the text without disturbing its styling
+    """
+    return self.__with_plain(self.plain.upper(), str.upper)
+
+  def lower(self) -> StyledText:
+    """
+    Lower-cases the text without disturbing its styling
+    """
+    return self.__with_plain(self.plain.lower(), str.lower)
+
+  def __with_plain(self, plain: str, fallback: Callable[[str], str]) -> StyledText:
+    """
+    A mangled helper method to replace the characters of the text with a same-length string, keeping each span's style
+    """
+    if len(plain) != len(self.plain):  # Some case changes alter lengths, such as 'ß' becoming 'SS', so each span is changed alone instead
+      return self.from_spans((fallback(text), style) for text, style in self.spans)
+    spans = []
+    idx = 0
+    for text, style in self.spans:
+      spans.append((plain[idx:idx + len(text)], style))
+      idx += len(text)
+    return self.from_spans(spans)
+
+  def __getitem__(self, key: Union[int, slice]) -> StyledText:
+    """
+    Slices the text by its visible characters, keeping each character's style
+    """
+    if isinstance(key, int):
+      key = slice(key, key + 1 if key != -1 else None)
+    start, stop, step = key.indices(len(self))
+    if step != 1:
+      raise ValueError("Styled text can only be sliced contiguously")
+    spans = []
+    offset = 0
+    for text, style in self.spans:
+      if offset + len(text) > start and offset < stop:
+        spans.append((text[max(start - offset, 0):stop - offset], style))
+      offset += len(text)
+    return self.from_spans(spans)
+
+  def __add__(self, other: Union[str, StyledText]) -> StyledText:
+    """
+    Concatenates styled text or strings, parsing any escape codes in a string
+    """
+    if not isinstance(other, (str, StyledText)):
+      return NotImplemented
+    return self.from_spans(self.spans + self.parse(other).spans)
+
+  def __radd__(self, other: str) -> StyledText:
+    """
+    Concatenates a string before styled text
+    """
+    if not isinstance(other, str):
+      return NotImplemented
+    return self.from_spans(self.parse(other).spans + self.spans)
+
+  def __len__(self) -> int:
+    """
+    Returns the number of visible characters
+    """
+    return len(self.plain)
+
+  def __eq__(self, other: object) -> bool:
+    """
+    Compares styled text by its spans
+    """
+    return isinstance(other, StyledText) and self.spans == other.spans
+
+  def __hash__(self) -> int:
+    """
+    Hashes styled text by its spans, as it is immutable
+    """
+    return hash(self.spans)
+
+  def __str__(self) -> str:
+    """
+    Renders the styled text
+    """
+    return self.render()
+
+  def __format__(self, format_spec: str) -> str:
+    """
+    Renders the styled text for use in f-strings
+    """
+    return format(self.render(), format_spec)
+
+  def __repr__(self) -> str:
+    """
+    A representation of the styled text's spans, for debugging purposes
+    """
+    return f"StyledText.from_spans({list(self.spans)!r})"
@@ -3,7 +3,7 @@ A collection of tools relating to text formatting and manipulation
 """
 
 
-import re
+from .styled import StyledText
 
 
 class Text:
@@ -138,17 +138,11 @@ class Text:
     """
     Converts the argument string into a heading format, accounting for most notable rule-exceptions (articles & formatting codes)
     """
-    formatting_data = {match.start(0): match.group() for match in re.finditer("\\x1b\[[\s\S]*?m", string)}  # Locate all the formatting escape codes in the string, and save the data
-    for formatting_string in list(formatting_data.values()):  # Strip the formatting from the string
-      string = string.replace(formatting_string, "")
-    articles = ["the", "a", "an"]
-    string = string.split(" ")
-    for idx, word in enumerate(string):
-      if word.lower() in articles and idx != 0 and idx != len(string) - 1:
-        string[idx] = word.lower()
-        continue
-      string[idx] = word[0].upper() + word[1:].lower()
-    string = " ".join(string)
-    for formatting_idx in formatting_data:  # Convert the correctly capitalized string back to have its old formatting
-      string = Text.string_insert(formatting_idx, formatting_data.get(formatting_idx), string)
-    return string
+    return StyledText.parse(string).heading().render(color=True)  # Formatting codes are kept in spans, rather than stripped and re-inserted
+
+  @staticmethod
+  def styled(string: str, *style: str) -> StyledText:
+    """
+    Convert the argument string into styled text with the given formatting codes, which can be combined without nesting resets
+    """
+    return StyledText(string, *style)
@@ -1,21 +1,35 @@
 from ..ConsoleControl.text import Text
+from ..ConsoleControl.backends import IOBackend
+
+from .stream import OutputStream
 
 
 class Output:
   """
   A collection of utilities that account for facilitated output
   """
+  @staticmethod
+  def print(*args, sep: str=" ", end: str="\n") -> None:
+    """
+    A replacement for the inbuilt 'print' function, which writes through the active I/O backend with the next frame or prompt
+    """
+    IOBackend.get().screen.print(sep.join([str(arg) for arg in args]) + end)
+
+  @staticmethod
+  def typewrite(*text: str, sep: str=" ", delay: float=0.03, skippable: bool=True) -> bool:
+    """
+    Reveals text one character at a time, as if being typed, unless the player presses a key to skip it
+    """
+    return OutputStream().typewrite_now(sep.join([str(words) for words in text]), delay=delay, skippable=skippable)
+
   @staticmethod
   def speech(speaker: str, *speech: str, sep: str="\n", blank_canvas: bool=False) -> str:
     """
     Takes parameters and formats an output that represents in-game speech
     """
     nl = "\n"
-    formatted_speaker = Text.magenta(Text.bold(f"[{speaker}]"))
-    text = f"{nl if not blank_canvas else ''}{formatted_speaker}\t"
-    for words in speech:
-      text += f"{words}{sep}"
-    return text[:-1]
+    formatted_speaker = Text.styled(f"[{speaker}]", Text.MAGENTA, Text.BOLD)  # A single reset, rather than one per nested call
+    return f"{nl if not blank_canvas else ''}{formatted_speaker}" + (f"\t{sep.join(str(words) for words in speech)}" if speech else "")  # Joined once, rather than grown by repeated concatenation, and with no separator if there is nothing to say
     
   @staticmethod
   def hint(*speech: str, sep: str="\n", blank_canvas: bool=False) -> str:
@@ -23,8 +37,5 @@ class Output:
     Takes parameters and formats an output that represents tutorial-like hints
     """
     nl = "\n"
-    formatted_speaker = Text.yellow(Text.bold("[HINT]"))
-    text = f"{nl if not blank_canvas else ''}{formatted_speaker}\t"
-    for words in speech:
-      text += f"{words}{sep}"
-    return text[:-1]
+    formatted_speaker = Text.styled("[HINT]", Text.YELLOW, Text.BOLD)
+    return f"{nl if not blank_canvas else ''}{formatted_speaker}" + (f"\t{sep.join(str(words) for words in speech)}" if speech else "")  # Joined once, rather than grown by repeated concatenation, and with no separator if there is nothing to say
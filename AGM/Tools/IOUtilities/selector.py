@@ -0,0 +1,157 @@
+"""
+A virtualized, paginated item selector, which only formats and draws the page of items being viewed
+"""
+
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import bisect
+import itertools
+
+from .errors import InvalidChoiceError
+
+from ..ConsoleControl.text import Text
+from ..ConsoleControl.styled import StyledText
+from ..ConsoleControl.screen import Frame
+from ..ConsoleControl.layout import Layout
+from ..ConsoleControl.backends import IOBackend
+
+
+class Selector:
+  """
+  A selector over a list or dictionary of items, with paging, jumping by number and type-to-filter by the start of an item's name
+  """
+  page_size = 10
+
+  def __init__(self, items: Union[List[Any], Dict[Any, Any]], labels: Optional[Union[List[Any], Dict[Any, Any]]]=None, page_size: Optional[int]=None) -> None:
+    if not isinstance(items, (list, dict)):
+      raise TypeError("The items parameter supplied was not of a valid type")
+    self.items = items
+    self.__labels = items if labels is None else labels  # Never copied, so a prompt costs the same however many items it has
+    if len(self.__labels) != len(self):
+      raise ValueError("There must be exactly one label for each item") from None
+    if page_size is not None:
+      self.page_size = page_size
+    self.__prefix_index: Optional[Tuple[List[str], List[int]]] = None
+
+  def __len__(self) -> int:
+    """
+    Returns the number of items to select from
+    """
+    return len(self.items)
+
+  def select(self, index: int) -> Any:
+    """
+    Returns the item at an index, without copying the keys of a dictionary
+    """
+    if not 0 <= index < len(self):
+      raise InvalidChoiceError("That integer does not correspond to an option") from None
+    return self.items[index] if isinstance(self.items, list) else self.items[self.__nth(self.items, index)]
+
+  def label(self, index: int) -> str:
+    """
+    Returns the displayed name of the item at an index
+    """
+    return str(self.__nth(self.__labels, index))
+
+  def matches(self, prefix: str) -> List[int]:
+    """
+    Returns the indexes of every item whose name starts with a prefix, ignoring case, in their original order
+    """
+    if self.__prefix_index is None:  # Built on the first filter, so selectors that are never filtered never format every name
+      ordered = sorted((StyledText.parse(str(label)).plain.lower(), idx) for idx, label in enumerate(self.__labels))
+      self.__prefix_index = ([name for name, _ in ordered], [idx for _, idx in ordered])
+    names, indexes = self.__prefix_index
+    prefix = prefix.lower()
+    start = bisect.bisect_left(names, prefix)
+    end = bisect.bisect_left(names, prefix + "\U0010ffff", lo=start)
+    return sorted(indexes[start:end])
+
+  def frame(self, sentence: str, view: Sequence[int], highlight: int, query: str="", start_buffer: bool=True) -> Frame:
+    """
+    Composes the page containing the highlighted item, formatting only the items on that page
+    """
+    columns = IOBackend.get().terminal_size()[0]
+    page = highlight // self.page_size
+    pages = max((len(view) - 1) // self.page_size + 1, 1)
+    frame = Frame(("\n" + Text.cyan("=" * 64) + "\n") if start_buffer else "")
+    for position in range(page * self.page_size, min((page + 1) * self.page_size, len(view))):
+      idx = view[position]
+      line = Layout.truncate(f"{idx + 1}) {self.label(idx)}", max(columns - 2, 1))
+      frame.add(Text.bold(f"> {line}") if position == highlight else f"  {line}")
+    if not view:
+      frame.add(Text.dim(f"  No options start with {query!r}"))
+    frame.add("")
+    frame.add(Text.dim(f"Page {page + 1}/{pages} ({len(view)} options) - arrows or page keys to move, type to filter, numbers to jump, enter to choose"))
+    frame.add(f"\n{sentence}\n\nInput:\t{query}")
+    return frame
+
+  def run(self, sentence: str, start_buffer: bool=True) -> Any:
+    """
+    Lets the user page through, filter and jump between the items, and returns the item chosen
+    """
+    backend = IOBackend.get()
+    screen = backend.screen
+    query = ""
+    view: Sequence[int] = range(len(self))  # All items, without building a list of every index
+    highlight = 0
+    has_moved = False  # Whether the user has moved the highlight themselves, as a bare enter chooses nothing
+    screen.render(self.frame(sentence, view, highlight, query, start_buffer))
+    with backend.session():
+      while True:
+        event = backend.read_event()
+        if event.name == "enter":
+          break
+        if event.name == "backspace" or (event.is_character and event.character.isprintable()):
+          query = query[:-1] if event.name == "backspace" else query + event.character
+          view, highlight = self.__filter(query)
+        elif event.name == "escape":
+          query = ""
+          view, highlight = range(len(self)), 0
+          has_moved = False
+        else:
+          highlight = self.__move(event.name, view, highlight)
+          has_moved = True
+          query = "" if query.isdecimal() else query  # A jump to a number is left behind once the user moves on from it
+        if not backend.has_pending():  # Redraw once per batch of keys
+          screen.render(self.frame(sentence, view, highlight, query, start_buffer))
+    screen.render(self.frame(sentence, view, highlight, query, start_buffer))
+    screen.release()
+
+    if query.isdecimal():
+      return self.select(int(query) - 1)
+    if not query and not has_moved:
+      raise InvalidChoiceError("No option was chosen") from None
+    if not view:
+      raise InvalidChoiceError("No option starts with that input") from None
+    return self.select(view[highlight])
+
+  @staticmethod
+  def __nth(collection: Union[List[Any], Dict[Any, Any]], index: int) -> Any:
+    """
+    A mangled helper method to return the element of a list, or the key of a dictionary, at an index, skipping through a dictionary's keys rather than copying them
+    """
+    if isinstance(collection, list):
+      return collection[index]
+    return next(itertools.islice(collection, index, None))
+
+  def __filter(self, query: str) -> Tuple[Sequence[int], int]:
+    """
+    A mangled helper method to find the items shown for a query, jumping to an item for a number and filtering by name otherwise
+    """
+    if query.isdecimal():  # Unlike isdigit, this excludes characters such as superscripts that int cannot parse
+      return range(len(self)), min(max(int(query) - 1, 0), max(len(self) - 1, 0))
+    if not query:
+      return range(len(self)), 0
+    return self.matches(query), 0
+
+  def __move(self, key: str, view: Sequence[int], highlight: int) -> int:
+    """
+    A mangled helper method to move the highlighted item for a navigation key
+    """
+    moves = {"up": -1, "down": 1, "left": -self.page_size, "right": self.page_size, "page_up": -self.page_size, "page_down": self.page_size}
+    if key == "home":
+      return 0
+    if key == "end":
+      return max(len(view) - 1, 0)
+    return min(max(highlight + moves.get(key, 0), 0), max(len(view) - 1, 0))
@@ -0,0 +1,95 @@
+"""
+A buffered output stream, with an asynchronous typewriter effect for revealing text
+"""
+
+
+from __future__ import annotations
+from typing import List, Optional
+
+import asyncio
+
+from ..ConsoleControl.backends import IOBackend
+from ..ConsoleControl.layout import ESCAPE_CODE_SPLIT
+
+
+class OutputStream:
+  """
+  A stream that batches written text into a buffer, writing it to the active I/O backend once per frame, prompt or flush
+  """
+  def __init__(self, backend: Optional[IOBackend]=None) -> None:
+    self.__backend = backend
+
+  @property
+  def backend(self) -> IOBackend:
+    """
+    The backend written to, which is the active backend unless one was given
+    """
+    return IOBackend.get() if self.__backend is None else self.__backend
+
+  def write(self, *args, sep: str=" ", end: str="\n") -> None:
+    """
+    Adds text to the buffer, in the same way that the inbuilt 'print' function would format it
+    """
+    self.backend.screen.print(sep.join([str(arg) for arg in args]) + end)
+
+  def flush(self) -> None:
+    """
+    Writes everything in the buffer to the backend in one write
+    """
+    self.backend.screen.flush()
+
+  def __enter__(self) -> OutputStream:
+    """
+    Starts a batch of writes, which are flushed together once it ends
+    """
+    return self
+
+  def __exit__(self, *exception_info) -> None:
+    """
+    Flushes the batch of writes
+    """
+    self.flush()
+
+  async def typewrite(self, text: str, delay: float=0.03, skippable: bool=True, end: str="\n") -> bool:
+    """
+    Reveals text one character at a time without blocking the event loop, showing the rest at once if a key is pressed, and returns whether it was skipped
+    """
+    steps = self.__steps(str(text))
+    backend = self.backend
+    backend.screen.print("")  # Leaves any region being drawn behind, as the revealed text is written directly
+    self.flush()  # Anything written before the text must appear before it
+    skipped = False
+    with backend.session():  # A terminal stays in cbreak mode, so a single key press can be noticed without enter
+      for idx, step in enumerate(steps):
+        if skippable and backend.read_event(timeout=0) is not None:  # The key that skips is consumed, rather than left for the next prompt
+          backend.screen.write("".join(steps[idx:]))
+          skipped = True
+          break
+        backend.screen.write(step)
+        await asyncio.sleep(delay)
+    backend.screen.write(end)
+    return skipped
+
+  def typewrite_now(self, text: str, delay: float=0.03, skippable: bool=True, end: str="\n") -> bool:
+    """
+    Reveals text one character at a time for callers outside of an event loop, and returns whether it was skipped
+    """
+    return asyncio.run(self.typewrite(text, delay=delay, skippable=skippable, end=end))
+
+  @staticmethod
+  def __steps(text: str) -> List[str]:
+    """
+    A mangled helper method to split text into the characters to reveal, keeping each escape code with the character after it
+    """
+    steps = []
+    codes = ""
+    for part in ESCAPE_CODE_SPLIT.split(text):
+      if part.startswith("\x1b"):
+        codes += part
+        continue
+      for character in part:
+        steps.append(codes + character)
+        codes = ""
+    if codes:  # Trailing codes, such as a final reset
+      steps.append(codes)
+    return steps
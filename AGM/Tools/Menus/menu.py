@@ -13,6 +13,8 @@ from .errors import InvalidMenuOperation
 
 from ..DesignPatterns.singleton import Singleton
 from ..ConsoleControl.console import Console
+from ..ConsoleControl.screen import Frame
+from ..ConsoleControl.backends import IOBackend
 
 
 class Menu:
@@ -37,17 +39,19 @@ class Menu:
     """
     Console.clear_now() if not buffer else None  # Clear the terminal if no buffer is wanted
     formatting_buffer = "\n" if buffer else ""
-    print(f"{formatting_buffer}{self.menu_title}\n")
-
+    frame = Frame(f"{formatting_buffer}{self.menu_title}\n")
     for idx, option in enumerate(self.options_list):
-      print(f"{idx + 1}) {option.name.title()}")
+      frame.add(f"{idx + 1}) {option.name.title()}")
+    screen = IOBackend.get().screen
+    screen.render(frame)  # Drawn in a single write
+    screen.release()
 
   def prompt(self) -> Any:
     """
     Prompt input from ther user chosing their desired menu option, and run and return that menu option
     """
     try:
-      option_index = int(input(self.menu_prompt)) - 1
+      option_index = int(Console.get_input(self.menu_prompt)) - 1
     except ValueError:
       raise TypeError("That input is not an integer") from None
 
@@ -1,6 +1,10 @@
-from typing import Dict, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Union
+
+from collections import deque
+import asyncio
 
 from .phase import Phase
+from .groups import PhaseGroup
 from .errors import PhaseError, PhaseTransitionError
 
 from ..DesignPatterns.singleton import Singleton
@@ -14,10 +18,37 @@ class PhaseApplication:
     self.phases = self.__class__.get_phases()
     for phase in self.phases:
       self.phases.get(phase).app = self
+    self.phase_table: List[Union[Phase, PhaseGroup]] = []  # Precomputed, so transitions never rebuild the phase list
+    self.phase_indexes: Dict[str, int] = {}
+    self.background_phases: List[Phase] = [phase for phase in self.phases.values() if phase.is_background]
+    self.__build_phase_table()
     self.current_phase_index = 0
     self.is_paused = False
     self.is_active = True
+    self.is_running = False
     self.last_result = None
+    self.__scheduled_phases = deque()  # Phase indexes queued to run, so transitions never nest phase calls
+    self.__background_tasks: List[asyncio.Task] = []
+
+  def __build_phase_table(self) -> None:
+    """
+    A mangled helper method to lay out the foreground phases in order, collapsing each parallel group into a single step where it is first declared
+    """
+    groups = {}
+    for name, phase in self.phases.items():
+      if phase.is_background:
+        continue
+      if phase.group_name is None:
+        self.phase_indexes[name] = len(self.phase_table)
+        self.phase_table.append(phase)
+        continue
+      if phase.group_name not in groups:
+        groups[phase.group_name] = PhaseGroup(phase.group_name, phase.group_executor, phase.group_max_workers)
+        groups.get(phase.group_name).app = self
+        self.phase_indexes[phase.group_name] = len(self.phase_table)
+        self.phase_table.append(groups.get(phase.group_name))
+      groups.get(phase.group_name).add(name, phase)
+      self.phase_indexes[name] = self.phase_indexes.get(phase.group_name)
 
   @classmethod
   def get_phases(cls) -> Dict[str, Callable]:
@@ -25,16 +56,16 @@ class PhaseApplication:
     A helper method to get all the user-defined phases from the 'child' class
     """
     return {name: phase for name, phase in cls.__dict__.items() if (
-      not name.startswith("__")
+      not name.startswith("__") and isinstance(phase, Phase)
     )}
 
   def run(self) -> None:
     """
-    Runs the currently active phase in the application
+    Runs the currently active phase in the application, followed by every phase it transitions to
     """
     if not self.is_valid_index(self.current_phase_index):
       raise PhaseError(f"Phase application phase index was invalid: {self.current_phase_index!r}") from None
-    self.last_result = self.run_active_phase()
+    self.__schedule(self.current_phase_index)
 
   def run_active_phase(self) -> Any:
     """
@@ -42,6 +73,87 @@ class PhaseApplication:
     """
     return self.get_phase(self.current_phase_index).run(self)
 
+  def __schedule(self, phase_index: int) -> None:
+    """
+    A mangled helper method to queue a phase to run, starting the scheduler loop unless it is already running
+    """
+    self.__scheduled_phases.append(phase_index)
+    if not self.is_running:
+      self.__run_scheduled_phases()
+
+  def __run_scheduled_phases(self) -> None:
+    """
+    A mangled helper method to run queued phases one after another at a constant stack depth
+    """
+    self.is_running = True
+    try:
+      phase = self.__next_scheduled_phase()
+      while phase is not None:
+        self.__finish_phase(phase.run(self))
+        phase = self.__next_scheduled_phase()
+    finally:
+      self.is_running = False
+
+  async def __run_scheduled_phases_async(self) -> None:
+    """
+    A mangled helper method to run queued phases one after another on the event loop, awaiting coroutine phases
+    """
+    self.is_running = True
+    try:
+      phase = self.__next_scheduled_phase()
+      while phase is not None:
+        self.__finish_phase(await phase.run_async(self))
+        phase = self.__next_scheduled_phase()
+    finally:
+      self.is_running = False
+
+  def __next_scheduled_phase(self) -> Optional[Union[Phase, PhaseGroup]]:
+    """
+    A mangled helper method to take the next queued phase, exiting the application once it moves past the final phase
+    """
+    if not self.__scheduled_phases or not self.is_active or self.is_paused:
+      return None
+    self.current_phase_index = self.__scheduled_phases.popleft()
+    if self.current_phase_index == len(self.phase_table):  # Moved past the final phase
+      self.exit()
+      return None
+    return self.get_phase(self.current_phase_index)
+
+  def __finish_phase(self, result: Any) -> None:
+    """
+    A mangled helper method to record a phase's result, advancing to the next phase if it finished without a transition
+    """
+    self.last_result = result
+    if not self.__scheduled_phases and self.is_active and not self.is_paused:
+      self.__scheduled_phases.append(self.current_phase_index + 1)
+
+  async def run_async(self) -> None:
+    """
+    Runs the currently active phase in the application on the event loop, followed by every phase it transitions to
+    """
+    if not self.is_valid_index(self.current_phase_index):
+      raise PhaseError(f"Phase application phase index was invalid: {self.current_phase_index!r}") from None
+    self.__scheduled_phases.append(self.current_phase_index)
+    await self.__run_scheduled_phases_async()
+
+  async def start_async(self) -> None:
+    """
+    Resets and runs the application from the beginning on the event loop, alongside its background phases
+    """
+    self.is_active = True
+    self.reset()
+    self.__background_tasks = [asyncio.create_task(phase.run_async(app=self)) for phase in self.background_phases]
+    await self.run_async()
+    if not self.is_active:  # Background phases are expected to return once the application exits
+      await self.wait_background()
+
+  async def wait_background(self) -> List[Any]:
+    """
+    Waits for every running background phase to complete, and returns their results
+    """
+    tasks, self.__background_tasks = self.__background_tasks, []
+    return list(await asyncio.gather(*tasks))
+
   def start(self) -> None:
     """
     Resets and runs the application from the beginning
@@ -68,6 +180,7 @@ class PhaseApplication:
     """
     self.current_phase_index = 0
     self.is_paused = False
+    self.__scheduled_phases.clear()
 
   def skip(self, n: int=1) -> None:
     """
@@ -80,7 +193,7 @@ class PhaseApplication:
     if not self.is_valid_index(self.current_phase_index + n):
       raise PhaseTransitionError(f"Cannot skip enough: Attempted to skip {n} Phases") from None
     self.current_phase_index += n
-    self.run_active_phase()
+    self.__schedule(self.current_phase_index)
 
   def rewind(self, n: int=1) -> None:
     """
@@ -93,18 +206,20 @@ class PhaseApplication:
     if not self.is_valid_index(self.current_phase_index - n):
       raise PhaseTransitionError(f"Cannot rewind enough: Attempted to rewind {n} Phases") from None
     self.current_phase_index -= n
-    self.run_active_phase()
+    self.__schedule(self.current_phase_index)
 
-  def go_to(self, phase_index: int) -> None:
+  def go_to(self, phase_index: Union[int, str]) -> None:
     """
-    Directly changes the current phase to the specified index
+    Directly changes the current phase to the specified index or phase name
     """
+    if isinstance(phase_index, str):
+      phase_index = self.index_of(phase_index)
     if not isinstance(phase_index, int):
       raise PhaseTransitionError(f"Cannot go to phase using a non-integer: {phase_index!r}")
     if not self.is_valid_index(phase_index):
       raise PhaseTransitionError(f"Cannot go to phase with index: {phase_index!r}")
     self.current_phase_index = phase_index
-    self.run_active_phase()
+    self.__schedule(self.current_phase_index)
 
   def exit(self) -> None:
     """
@@ -116,16 +231,25 @@ class PhaseApplication:
     """
     A helper method to check the validity of an inputted index
     """
-    return index >= 0 and index <= len(self.phases)
+    return index >= 0 and index <= len(self.phase_table)
+
+  def index_of(self, phase_name: str) -> int:
+    """
+    Fetches the index of a phase from its name
+    """
+    try:
+      return self.phase_indexes[phase_name]
+    except KeyError:
+      raise PhaseError(f"Phase with name {phase_name!r} does not exist") from None
 
-  def get_phase(self, index: int) -> Phase:
+  def get_phase(self, index: int) -> Union[Phase, PhaseGroup]:
     """
     Fetches a specified phase from its index
     """
     try:
       if index < 0:
         raise PhaseError("A phase cannot have a negative index")
-      return list(self.phases.values())[index]
+      return self.phase_table[index]
     except IndexError:
       raise PhaseError(f"Phase at index '{index}' does not exist") from None
     except TypeError:
@@ -133,10 +257,43 @@ class PhaseApplication:
 
   def phase(phase: Callable) -> Phase:
     """
-    A simple decorator to convert a user-defined callable into a valid phase object
+    A simple decorator to convert a user-defined callable or coroutine function into a valid phase object
     """
     return Phase(phase)
 
+  def background(phase: Callable) -> Phase:
+    """
+    A simple decorator to convert a user-defined callable into a background phase, which runs alongside the other phases when started asynchronously
+    """
+    background_phase = Phase(phase)
+    background_phase.is_background = True
+    return background_phase
+
+  def parallel_group(group_name: str, executor: str="thread", max_workers: Optional[int]=None) -> Callable:
+    """
+    A decorator to convert a user-defined callable into a phase that runs concurrently with the rest of its named group, on a thread or process pool
+    """
+    
+    def _parallel_group(phase: Callable) -> Phase:
+      grouped_phase = phase if isinstance(phase, Phase) else Phase(phase)
+      grouped_phase.group_name = group_name
+      grouped_phase.group_executor = executor
+      grouped_phase.group_max_workers = max_workers
+      return grouped_phase
+    return _parallel_group
+
+  def retain(keep: Optional[int]=None, spill_path: Optional[str]=None) -> Callable:
+    """
+    A decorator to bound the results a phase keeps in memory, applied above the phase decorator
+    """
+    
+    def _retain(phase: Phase) -> Phase:
+      if not isinstance(phase, Phase):
+        raise PhaseError(f"Result retention can only be applied to a phase: {phase!r}") from None
+      phase.retain_results(keep, spill_path)
+      return phase
+    return _retain
+
   def Application(*args, **kwargs) -> Callable:
     """
     A class decorator to add all functionality and behaviours to the user-defined 'child' application class
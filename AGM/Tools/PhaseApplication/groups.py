@@ -0,0 +1,105 @@
+"""
+Groups of independent phases, which are run concurrently on a thread or process pool
+"""
+
+
+from __future__ import annotations
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import importlib
+
+from .phase import Phase
+from .errors import PhaseError
+
+if TYPE_CHECKING:
+  from .application import PhaseApplication
+
+
+class PhaseGroup:
+  """
+  A single step of a phase application made up of several phases, which all run concurrently before the application moves on
+  """
+  EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+  def __init__(self, name: str, executor: str="thread", max_workers: Optional[int]=None) -> None:
+    if executor not in self.EXECUTORS:
+      raise PhaseError(f"Unknown parallel phase group executor: {executor!r}") from None
+    self.app = None
+    self.name = name
+    self.executor = executor
+    self.max_workers = max_workers
+    self.members: List[Tuple[str, Phase]] = []
+    self.last_result = None
+    self.is_background = False
+
+  def add(self, name: str, phase: Phase) -> None:
+    """
+    Adds a phase to the group, which must share the group's executor settings
+    """
+    if (phase.group_executor, phase.group_max_workers) != (self.executor, self.max_workers):
+      raise PhaseError(f"Phase {name!r} was declared with different executor settings to the rest of phase group {self.name!r}") from None
+    self.members.append((name, phase))
+
+  def run(self, app: PhaseApplication) -> List[Any]:
+    """
+    Runs every phase of the group on a new pool, blocking until all have finished, and returns their results in declaration order
+    """
+    if self.app.is_active and not self.app.is_paused:
+      with self.__pool() as pool:
+        futures = [self.__submit(pool, app, name, phase) for name, phase in self.members]
+        return self.__collect([future.result() for future in futures])
+
+  async def run_async(self, app: PhaseApplication) -> List[Any]:
+    """
+    Runs every phase of the group on a new pool without blocking the event loop, and returns their results in declaration order
+    """
+    if self.app.is_active and not self.app.is_paused:
+      loop = asyncio.get_running_loop()
+      with self.__pool() as pool:
+        futures = [asyncio.wrap_future(self.__submit(pool, app, name, phase), loop=loop) for name, phase in self.members]
+        return self.__collect(list(await asyncio.gather(*futures)))
+
+  def __pool(self) -> Executor:
+    """
+    A mangled helper method to create the pool that the group runs on
+    """
+    return self.EXECUTORS.get(self.executor)(max_workers=self.max_workers)
+
+  def __submit(self, pool: Executor, app: PhaseApplication, name: str, phase: Phase) -> Any:
+    """
+    A mangled helper method to submit one phase of the group to the pool
+    """
+    if self.executor == "process":  # Phases are looked up by name in the worker, as neither they nor the application can be pickled
+      return pool.submit(PhaseGroup.run_in_process, type(app).__module__, type(app).__qualname__, name)
+    return pool.submit(PhaseGroup.run_in_thread, app, phase)
+
+  def __collect(self, results: List[Any]) -> List[Any]:
+    """
+    A mangled helper method to store each phase's result in that phase, in declaration order
+    """
+    for (_, phase), result in zip(self.members, results):
+      phase.add_result(result)
+    self.last_result = results
+    return results
+
+  @staticmethod
+  def run_in_thread(app: PhaseApplication, phase: Phase) -> Any:
+    """
+    Calls a phase's user-defined callable on a pool thread, running it to completion if it is a coroutine function
+    """
+    result = phase.phase(app, *phase.args, **phase.kwargs)
+    return asyncio.run(result) if phase.is_coroutine else result
+
+  @staticmethod
+  def run_in_process(module_name: str, class_name: str, phase_name: str) -> Any:
+    """
+    Calls a phase's user-defined callable in a worker process, without an application as it cannot cross processes
+    """
+    app_class = importlib.import_module(module_name)
+    for attribute in class_name.split("."):
+      app_class = getattr(app_class, attribute)
+    phase = app_class.__dict__.get(phase_name)
+    result = phase.phase(None, *phase.args, **phase.kwargs)
+    return asyncio.run(result) if phase.is_coroutine else result
@@ -1,5 +1,11 @@
 from __future__ import annotations
-from typing import Callable, Any, TYPE_CHECKING
+from typing import Callable, Coroutine, Optional, Any, TYPE_CHECKING
+
+import asyncio
+import inspect
+import threading
+
+from .results import PhaseResults
 
 if TYPE_CHECKING:
   from .application import PhaseApplication
@@ -9,13 +15,21 @@ class Phase:
   """
   A wrapper to add all data and functionality to a user-defined phase
   """
+  __loop: Optional[asyncio.AbstractEventLoop] = None  # The event loop thread for coroutine phases run synchronously from inside another event loop, started on first use
+  __loop_lock = threading.Lock()
+
   def __init__(self, phase: Callable, *args, **kwargs) -> None:
     self.app = None
     self.phase = phase
     self.args = args
     self.kwargs = kwargs
     self.last_result = None
-    self.results = []
+    self.results = PhaseResults()
+    self.is_background = False
+    self.group_name = None
+    self.group_executor = None
+    self.group_max_workers = None
+    self.is_coroutine = inspect.iscoroutinefunction(phase)
 
   def run(self, app: PhaseApplication) -> Any:
     """
@@ -23,17 +37,61 @@ class Phase:
     """
     if self.app.is_active:
       if not self.app.is_paused:
-        self.last_result = self.phase(app, *self.args, **self.kwargs)
-        self.results.append(self.last_result)
-        try:
-          self.app.skip()
-        except IndexError:
-          pass
-        return self.last_result
+        result = self.phase(app, *self.args, **self.kwargs)
+        if self.is_coroutine:
+          result = Phase.run_coroutine(result)
+        return self.add_result(result)  # Moving on to the next phase is left to the application's scheduler
+
+  async def run_async(self, app: PhaseApplication) -> Any:
+    """
+    A method to run this phase on the event loop, awaiting the user-defined callable if it is a coroutine function
+    """
+    if self.app.is_active:
+      if not self.app.is_paused or self.is_background:
+        result = self.phase(app, *self.args, **self.kwargs)
+        if self.is_coroutine:
+          result = await result
+        return self.add_result(result)
+
+  @classmethod
+  def run_coroutine(cls, coroutine: Coroutine) -> Any:
+    """
+    Runs a coroutine to completion from synchronous code, on its own event loop, or on a dedicated loop thread if the calling thread is already running an event loop (which it cannot block on)
+    """
+    try:
+      asyncio.get_running_loop()
+    except RuntimeError:
+      return asyncio.run(coroutine)
+    return asyncio.run_coroutine_threadsafe(coroutine, cls.__dedicated_loop()).result()
+
+  @classmethod
+  def __dedicated_loop(cls) -> asyncio.AbstractEventLoop:
+    """
+    A mangled helper method to return the shared event loop thread for coroutines run from inside another event loop, starting it if needed
+    """
+    with Phase.__loop_lock:
+      if Phase.__loop is None:  # Set on the base class, so that every phase class shares one loop thread
+        Phase.__loop = asyncio.new_event_loop()
+        threading.Thread(target=Phase.__loop.run_forever, name="Phase Event Loop", daemon=True).start()
+      return Phase.__loop
+
+  def add_result(self, result: Any) -> Any:
+    """
+    Stores a completed result of this phase in its result storage, and returns it
+    """
+    self.last_result = result
+    self.results.append(result)
+    return result
+
+  def retain_results(self, keep: Optional[int]=None, spill_path: Optional[str]=None) -> None:
+    """
+    Configures how many of this phase's latest results are kept in memory (all if None), optionally spilling older results to a file
+    """
+    self.results = PhaseResults(keep, spill_path)
 
   def get_result(self, result_idx: int) -> Any:
     """
-    Gets a result at a specified index from the result storage of this phase object
+    Gets a result at a specified index from the result storage of this phase object, including results spilled to disk
     """
     try:
       return self.results[result_idx]
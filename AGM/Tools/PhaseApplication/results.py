@@ -0,0 +1,135 @@
+"""
+A bounded result storage for phases, which can spill evicted results to an on-disk log
+"""
+
+
+from typing import Any, Iterator, Optional
+
+from array import array
+from collections import deque
+import os
+import pickle
+
+from .errors import PhaseError
+
+
+class PhaseResults:
+  """
+  A sequence of a phase's results, keeping only the latest results in memory and optionally spilling older results to disk
+  """
+  def __init__(self, keep: Optional[int]=None, spill_path: Optional[str]=None) -> None:
+    if keep is not None and keep < 0:
+      raise PhaseError(f"A phase cannot keep a negative number of results: {keep!r}") from None
+    self.keep = keep
+    self.spill_path = spill_path
+    self.total = 0
+    self.__retained = deque(maxlen=keep)
+    self.__spill_offsets = array("Q")  # The offset of each spilled result in the spill log
+    self.__spill_file = None
+
+  def append(self, result: Any) -> None:
+    """
+    Stores a new result, evicting (and spilling, if enabled) the oldest result once the retention limit is reached
+    """
+    if self.keep is not None and len(self.__retained) == self.keep:
+      evicted = self.__retained[0] if self.keep else result
+      if self.spill_path is not None:
+        self.__spill(evicted)
+    self.__retained.append(result)
+    self.total += 1
+
+  def first_index(self) -> int:
+    """
+    Returns the index of the oldest result that can still be read back
+    """
+    if self.spill_path is not None or self.keep is None:
+      return 0
+    return self.total - len(self.__retained)
+
+  def clear(self) -> None:
+    """
+    Removes every stored result, including any spilled to disk
+    """
+    self.__retained.clear()
+    self.__spill_offsets = array("Q")
+    self.total = 0
+    if self.__spill_file is not None:
+      self.__spill_file.seek(0)
+      self.__spill_file.truncate()
+
+  def __spill(self, result: Any) -> None:
+    """
+    A mangled helper method to append an evicted result to the spill log
+    """
+    spill_file = self.__open_spill_file()
+    spill_file.seek(0, os.SEEK_END)
+    offset = spill_file.tell()
+    try:
+      pickle.dump(result, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+      spill_file.truncate(offset)  # Drop any partially written result
+      raise PhaseError(f"Phase result could not be spilled to disk: {result!r}") from None
+    self.__spill_offsets.append(offset)
+
+  def __read_spilled(self, idx: int) -> Any:
+    """
+    A mangled helper method to lazily read a spilled result back from the spill log
+    """
+    spill_file = self.__open_spill_file()
+    spill_file.flush()
+    spill_file.seek(self.__spill_offsets[idx])
+    return pickle.load(spill_file)
+
+  def __open_spill_file(self):
+    """
+    A mangled helper method to open the spill log, starting a new log unless results have already been spilled to it
+    """
+    if self.__spill_file is None:
+      directory = os.path.dirname(self.spill_path)
+      if directory:
+        os.makedirs(directory, exist_ok=True)
+      self.__spill_file = open(self.spill_path, "r+b" if self.__spill_offsets else "w+b")
+    return self.__spill_file
+
+  def __getitem__(self, idx: int) -> Any:
+    """
+    Gets a result from its index among every result ever stored, reading it back from disk if it has been spilled
+    """
+    if not isinstance(idx, int):
+      raise TypeError(f"Phase result indexes must be integers: {idx!r}")
+    if idx < 0:
+      idx += self.total
+    if idx < self.first_index() or idx >= self.total:
+      raise IndexError(f"Phase result at index {idx} is not stored")
+    retained_start = self.total - len(self.__retained)
+    if idx >= retained_start:
+      return self.__retained[idx - retained_start]
+    return self.__read_spilled(idx)
+
+  def __len__(self) -> int:
+    """
+    Returns the number of results ever stored, including evicted results
+    """
+    return self.total
+
+  def __iter__(self) -> Iterator[Any]:
+    """
+    Iterates over every result that can still be read back, oldest first
+    """
+    for idx in range(self.first_index(), self.total):
+      yield self[idx]
+
+  def __getstate__(self) -> dict:
+    """
+    Excludes the open spill log from pickling, which is reopened when next needed
+    """
+    state = self.__dict__.copy()
+    state["_PhaseResults__spill_file"] = None
+    return state
+
+  def __del__(self) -> None:
+    """
+    Closes the spill log once the result storage is discarded
+    """
+    if self.__dict__.get("_PhaseResults__spill_file") is not None:
+      self.__spill_file.close()
@@ -0,0 +1,82 @@
+"""
+A collection of tools for the save catalog, which describes saves through small metadata sidecars instead of the saves themselves
+"""
+
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+import json
+
+from .storage import StorageBackend
+
+
+class SaveInfo:
+  """
+  A wrapper containing the catalogued metadata of a single save
+  """
+  def __init__(self, save_name: str, save_path: str, metadata: Dict[str, Any]) -> None:
+    self.save_name = save_name
+    self.save_path = save_path
+    self.metadata = metadata
+    self.description = metadata.get("description", save_name)
+    self.is_protected = metadata.get("protected", False)
+    self.saved_at = metadata.get("saved_at")
+
+  def is_instance_of(self, preservable_class: type) -> bool:
+    """
+    Checks whether the catalogued save was made by the given preservable class or a subclass of it
+    """
+    return preservable_class.__name__ in self.metadata.get("types", [])
+
+  def __getitem__(self, key: str) -> Any:
+    """
+    Fetches any other field of the catalogued metadata
+    """
+    return self.metadata[key]
+
+  def __str__(self) -> str:
+    """
+    String representation of the catalogued save, as shown in save browsers
+    """
+    return self.description
+
+
+class SaveCatalog:
+  """
+  A static class to read and write the metadata sidecars that sit next to each save
+  """
+  @staticmethod
+  def info_entry(save_name: str) -> str:
+    """
+    Returns the name of the metadata sidecar entry of a save
+    """
+    return f"Save Info - {save_name}"
+
+  @staticmethod
+  def encode(metadata: Dict[str, Any]) -> bytes:
+    """
+    Serializes a metadata record for a sidecar
+    """
+    return json.dumps(metadata, default=str).encode()
+
+  @classmethod
+  def read(cls, backend: StorageBackend, save_name: str, save_path: str) -> Optional[SaveInfo]:
+    """
+    Reads the metadata sidecar of a save, returning None if it is missing or unreadable
+    """
+    return cls.read_many(backend, save_path, [save_name])[0]
+
+  @classmethod
+  def read_many(cls, backend: StorageBackend, save_path: str, save_names: List[str]) -> List[Optional[SaveInfo]]:
+    """
+    Reads the metadata sidecars of many saves in a single bulk read, returning None for any that are missing or unreadable
+    """
+    sidecars = backend.get_many([(save_path, save_name, cls.info_entry(save_name)) for save_name in save_names])
+    saves = []
+    for (_, save_name, _), data in sidecars.items():
+      try:
+        saves.append(SaveInfo(save_name, save_path, json.loads(data)))
+      except (TypeError, ValueError):
+        saves.append(None)
+    return saves
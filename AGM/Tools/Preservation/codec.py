@@ -0,0 +1,165 @@
+"""
+A collection of tools for encoding saved data, using pickle protocol 5 with optional stdlib compression
+"""
+
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hashlib import sha256
+import _pickle as pickle
+import io
+import struct
+import zlib
+import lzma
+import bz2
+
+from .errors import AccessError, SaveError
+
+
+MAGIC = b"AGMSAVE"
+FORMAT_VERSION = 2
+HEADER = struct.Struct(">BBI")  # Format version, codec ID, number of out-of-band buffers
+CHECKSUM = struct.Struct(">32s")  # From format version 2, a SHA256 digest of the body that follows the header
+LENGTH = struct.Struct(">Q")
+
+
+class SaveCodec:
+  """
+  A static class to encode and decode saved data behind a small header, so that the codec can be detected on load
+  """
+  # Codec name: (codec ID, compressor factory taking a level, one-shot decompressor)
+  CODECS: Dict[str, Tuple[int, Callable[[Optional[int]], Any], Callable[[bytes], bytes]]] = {
+    "none": (0, lambda level: None, lambda data: data), 
+    "zlib": (1, lambda level: zlib.compressobj(-1 if level is None else level), zlib.decompress), 
+    "lzma": (2, lambda level: lzma.LZMACompressor(preset=level), lzma.decompress), 
+    "bz2": (3, lambda level: bz2.BZ2Compressor(9 if level is None else level), bz2.decompress)
+  }
+
+  @classmethod
+  def encode(cls, obj: Any, codec: str="none", level: Optional[int]=None, persistent_id: Optional[Callable[[Any], Any]]=None) -> bytes:
+    """
+    Pickles an object with protocol 5, passing large binary payloads out-of-band, and compresses the result with the given codec
+    """
+    if codec not in cls.CODECS:
+      raise SaveError(f"Unknown save codec: {codec!r}")
+    codec_id, compressor_factory, _ = cls.CODECS.get(codec)
+
+    buffers: List[pickle.PickleBuffer] = []
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, protocol=5, buffer_callback=buffers.append)
+    if persistent_id is not None:
+      pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+    stream = f.getbuffer()
+    chunks = [LENGTH.pack(len(stream)), stream]
+    for buffer in buffers:
+      raw = buffer.raw()  # A flat view onto the payload, rather than a copy of it
+      chunks.extend([LENGTH.pack(raw.nbytes), raw])
+
+    compressor = compressor_factory(level)
+    if compressor is not None:
+      chunks = [compressor.compress(chunk) for chunk in chunks] + [compressor.flush()]
+    checksum = sha256()
+    for chunk in chunks:
+      checksum.update(chunk)
+    return b"".join([MAGIC, HEADER.pack(FORMAT_VERSION, codec_id, len(buffers)), CHECKSUM.pack(checksum.digest()), *chunks])
+
+  @classmethod
+  def recode(cls, data: bytes, codec: str, level: Optional[int]=None) -> bytes:
+    """
+    Compresses data encoded with the 'none' codec with another codec, without pickling the object again
+    """
+    if codec not in cls.CODECS:
+      raise SaveError(f"Unknown save codec: {codec!r}")
+    if cls.codec_of(data) != "none":
+      raise SaveError("Only data encoded with the 'none' codec can be recoded") from None
+    if codec == "none":
+      return data
+    codec_id, compressor_factory, _ = cls.CODECS.get(codec)
+    _, _, n_buffers, _, body_offset = cls.__read_header(data)
+    compressor = compressor_factory(level)
+    body = compressor.compress(memoryview(data)[body_offset:]) + compressor.flush()
+    return b"".join([MAGIC, HEADER.pack(FORMAT_VERSION, codec_id, n_buffers), CHECKSUM.pack(sha256(body).digest()), body])
+
+  @classmethod
+  def decode(cls, data: bytes, persistent_load: Optional[Callable[[Any], Any]]=None) -> Any:
+    """
+    Decodes saved data written by any codec, or by the unheadered format that came before codecs existed
+    """
+    if not data.startswith(MAGIC):
+      return cls.__unpickle(data, [], persistent_load)
+
+    version, codec_id, n_buffers, checksum, body_offset = cls.__read_header(data)
+    try:
+      decompressor = next(decompressor for _codec_id, _, decompressor in cls.CODECS.values() if _codec_id == codec_id)
+    except StopIteration:
+      raise AccessError("This save has an unrecognised save format header") from None
+    if checksum is not None and sha256(memoryview(data)[body_offset:]).digest() != checksum:
+      raise AccessError("This save is corrupted, as its checksum does not match its contents") from None
+
+    body = memoryview(decompressor(memoryview(data)[body_offset:]))
+    sections = []
+    offset = 0
+    for _ in range(n_buffers + 1):  # The pickle stream, followed by its out-of-band buffers
+      (length, ) = LENGTH.unpack_from(body, offset)
+      offset += LENGTH.size
+      sections.append(body[offset:offset + length])
+      offset += length
+    return cls.__unpickle(sections[0], sections[1:], persistent_load)
+
+  @classmethod
+  def verify(cls, data: bytes) -> Optional[bool]:
+    """
+    Checks saved data against its checksum without decoding it, returning None for formats that came before checksums existed
+    """
+    if not data.startswith(MAGIC):
+      return None
+    _, _, _, checksum, body_offset = cls.__read_header(data)
+    if checksum is None:
+      return None
+    return sha256(memoryview(data)[body_offset:]).digest() == checksum
+
+  @staticmethod
+  def __read_header(data: bytes) -> Tuple[int, int, int, Optional[bytes], int]:
+    """
+    A mangled helper method to parse the header of saved data, returning its fields, its checksum (if any), and where its body begins
+    """
+    try:
+      version, codec_id, n_buffers = HEADER.unpack_from(data, len(MAGIC))
+      if version > FORMAT_VERSION:
+        raise AccessError(f"This save was written by a newer save format (version {version})") from None
+      if version < 2:
+        return version, codec_id, n_buffers, None, len(MAGIC) + HEADER.size
+      (checksum, ) = CHECKSUM.unpack_from(data, len(MAGIC) + HEADER.size)
+      return version, codec_id, n_buffers, checksum, len(MAGIC) + HEADER.size + CHECKSUM.size
+    except struct.error:
+      raise AccessError("This save has an unrecognised save format header") from None
+
+  @staticmethod
+  def __unpickle(stream: bytes, buffers: List[memoryview], persistent_load: Optional[Callable[[Any], Any]]) -> Any:
+    """
+    A mangled helper method to unpickle a stream with its out-of-band buffers, resolving any persistent IDs
+    """
+    unpickler = pickle.Unpickler(io.BytesIO(stream), buffers=buffers)
+    if persistent_load is not None:
+      unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+  @classmethod
+  def codec_of(cls, data: bytes) -> Optional[str]:
+    """
+    Detects the codec that some saved data was encoded with, or None for the unheadered format that came before codecs existed
+    """
+    if not data.startswith(MAGIC):
+      return None
+    codec_id = data[len(MAGIC) + 1]
+    return next((codec for codec, (_codec_id, _, _) in cls.CODECS.items() if _codec_id == codec_id), None)
+
+  @classmethod
+  def checksum_of(cls, data: bytes) -> Optional[bytes]:
+    """
+    Returns the checksum stored in the header of some saved data, or None for formats that came before checksums existed
+    """
+    if not data.startswith(MAGIC):
+      return None
+    return cls.__read_header(data)[3]
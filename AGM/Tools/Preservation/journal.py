@@ -0,0 +1,63 @@
+"""
+An append-only change journal, used to save the dirty attributes of a preservable object between full snapshots
+"""
+
+
+from __future__ import annotations
+from typing import Iterable, Tuple, TYPE_CHECKING
+
+import _pickle as pickle
+import io
+
+if TYPE_CHECKING:
+  from .preservable import Preservable
+  from .shards import ShardStore
+
+
+# Values of these types are always pickled in-place, as sharing them by identity is meaningless
+ATOMIC_TYPES = (str, bytes, int, float, complex, bool, type(None), tuple, frozenset, range)
+
+
+class Journal:
+  """
+  A static class to serialize and replay the entries of a save's journal, each holding the changed attributes from one save
+  """
+  @staticmethod
+  def entry(preservable: Preservable, attribute_names: Iterable[str], shards: ShardStore) -> bytes:
+    """
+    Serializes an entry containing the current values of the given attributes, tagged with the generation of the preservable's last snapshot
+    """
+    state = preservable.__getstate__()
+    attribute_names = set(attribute_names)
+    references = {id(value): ("attribute", name) for name, value in state.items() if (
+      name not in attribute_names and not isinstance(value, ATOMIC_TYPES)
+    )}
+    references[id(preservable)] = ("self", )
+
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f)
+    pickler.persistent_id = lambda obj: shards.persistent_id(obj, references=references)
+    pickler.dump((state.get("_Preservable__save_generation", 0), {name: state[name] for name in attribute_names if name in state}))
+    return f.getvalue()
+
+  @staticmethod
+  def replay(data: bytes, preservable: Preservable, shards: ShardStore) -> Tuple[int, int]:
+    """
+    Applies every complete entry from the generation of the loaded snapshot onto the preservable object in order, returning the number of entries applied and the length of the journal's complete entries
+    """
+    n_entries = 0
+    valid_length = 0
+    f = io.BytesIO(data)
+    unpickler = pickle.Unpickler(f)
+    unpickler.persistent_load = shards.persistent_load
+    while True:
+      try:
+        generation, attributes = unpickler.load()
+      except (EOFError, pickle.UnpicklingError):  # End of the journal, or a partially written final entry
+        break
+      valid_length = f.tell()
+      if generation != preservable.__dict__.get("_Preservable__save_generation", 0):  # Left over from before a snapshot which was interrupted before its journal was cleared
+        continue
+      preservable.__dict__.update(attributes)
+      n_entries += 1
+    return n_entries, valid_length
@@ -0,0 +1,129 @@
+"""
+An offline maintenance tool for a root of many saves, which verifies, migrates and compacts them in parallel without any prompts
+"""
+
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import sys
+import time
+
+from .preservable import Preservable
+from .codec import SaveCodec
+from .errors import SaveError
+from .storage import StorageBackend, SQLiteBackend
+
+
+class SaveMaintenance:
+  """
+  A static class to scan a save root and run maintenance tasks over every save in it on a process pool
+  """
+  @staticmethod
+  def scan(save_root: str, storage_backend: Optional[StorageBackend]=None) -> List[Tuple[str, str]]:
+    """
+    Finds every save within a save root, at any depth, returning the path and name of each
+    """
+    return (storage_backend or Preservable.storage_backend).saves(save_root)
+
+  @staticmethod
+  def verify(save_path: str, save_name: str, deep: bool=False, storage_backend: Optional[StorageBackend]=None) -> Dict[str, Any]:
+    """
+    Checks each entry of a save against its checksum, and optionally decodes the whole save, returning the result of each check
+    """
+    storage_backend = storage_backend or Preservable.storage_backend
+    entries = [entry for entry in storage_backend.entries(save_path, save_name) if entry.startswith("Save Data - ") or entry.startswith("Save Shard - ")]
+    checks = {}
+    for (_, _, entry), data in storage_backend.get_many([(save_path, save_name, entry) for entry in entries]).items():
+      is_valid = SaveCodec.verify(data)
+      checks[entry] = "unchecked" if is_valid is None else ("ok" if is_valid else "corrupt")
+    if deep:
+      try:
+        preservable = Preservable.read(save_name, save_path, storage_backend=storage_backend)
+        preservable.load_shards(*[entry[len("Save Shard - "):] for entry in entries if entry.startswith("Save Shard - ")])
+        checks["decode"] = "ok"
+      except Exception as e:
+        checks["decode"] = f"failed: {e}"
+    return checks
+
+  @staticmethod
+  def maintain(
+    save_path: str, save_name: str, verify: bool=True, deep: bool=False, migrate: bool=False, compact: bool=False, 
+    save_codec: Optional[str]=None, save_compression_level: Optional[int]=None, storage_backend: Optional[StorageBackend]=None
+  ) -> Dict[str, Any]:
+    """
+    Runs the chosen maintenance tasks over a single save, returning a machine-readable report entry rather than raising
+    """
+    start = time.perf_counter()
+    report = {"save_path": save_path, "save_name": save_name, "ok": True, "checks": {}, "migrated": False, "compacted": False, "error": None}
+    try:
+      if verify:
+        report["checks"] = SaveMaintenance.verify(save_path, save_name, deep=deep, storage_backend=storage_backend)
+        if any(result != "ok" and result != "unchecked" for result in report["checks"].values()):
+          report["ok"] = False
+          return report  # Never rewrite a save that failed verification
+      if migrate or compact:
+        preservable = Preservable.read(save_name, save_path, storage_backend=storage_backend)
+        if migrate:
+          report["migrated"] = preservable.upgrade_schema()
+        if compact or report["migrated"]:
+          preservable.compact(save_codec=save_codec, save_compression_level=save_compression_level)
+          preservable.flush()  # Saves made with background writes only queue the rewrite, which would be lost when the worker exits
+          written_codec = SaveCodec.codec_of(preservable.storage_backend.read(save_path, preservable.save_name, f"Save Data - {preservable.save_name}") or b"")
+          if written_codec != preservable.save_codec:
+            raise SaveError(f"The compacted save was written with codec {written_codec!r} rather than {preservable.save_codec!r}")
+          report["compacted"] = True
+    except Exception as e:
+      report["ok"] = False
+      report["error"] = f"{type(e).__name__}: {e}"
+    finally:
+      report["seconds"] = round(time.perf_counter() - start, 6)
+    return report
+
+  @classmethod
+  def run(cls, save_root: str, workers: Optional[int]=None, storage_backend: Optional[StorageBackend]=None, **tasks: Any) -> Dict[str, Any]:
+    """
+    Runs the chosen maintenance tasks over every save in a save root on a process pool, and returns the full report
+    """
+    saves = cls.scan(save_root, storage_backend=storage_backend)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      futures = [pool.submit(cls.maintain, save_path, save_name, storage_backend=storage_backend, **tasks) for save_path, save_name in saves]
+      results = [future.result() for future in futures]
+    return {
+      "save_root": save_root, 
+      "saves": len(results), 
+      "failed": len([result for result in results if not result["ok"]]), 
+      "seconds": round(time.perf_counter() - start, 6), 
+      "results": results
+    }
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+  """
+  The command-line entry point, which prints the report as JSON and exits non-zero if any save failed
+  """
+  parser = argparse.ArgumentParser(description="Verify, migrate and compact every save in a save root")
+  parser.add_argument("save_root")
+  parser.add_argument("--no-verify", dest="verify", action="store_false", help="skip checksum verification")
+  parser.add_argument("--deep", action="store_true", help="also decode every save and shard while verifying")
+  parser.add_argument("--migrate", action="store_true", help="apply schema migrations (the save classes must be importable)")
+  parser.add_argument("--compact", action="store_true", help="rewrite each save as a full snapshot in the current format")
+  parser.add_argument("--codec", dest="save_codec", choices=list(SaveCodec.CODECS), help="the codec to rewrite saves with")
+  parser.add_argument("--level", dest="save_compression_level", type=int, help="the compression level to rewrite saves with")
+  parser.add_argument("--workers", type=int, help="the number of worker processes")
+  parser.add_argument("--sqlite", help="an SQLite save database to maintain, instead of save files")
+  args = vars(parser.parse_args(argv))
+  sqlite_database = args.pop("sqlite")
+  args["storage_backend"] = SQLiteBackend(sqlite_database) if sqlite_database is not None else None
+
+  report = SaveMaintenance.run(args.pop("save_root"), workers=args.pop("workers"), **args)
+  json.dump(report, sys.stdout, indent=2)
+  print()
+  return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -4,16 +4,20 @@ A collection of tools allowing for saved data integration
 
 
 from __future__ import annotations
-from typing import Optional, Set, Any, Callable, List
+from typing import Optional, Any, Callable, Iterable, List, Dict
 
 from hashlib import sha256
-import _pickle as pickle
-import os
 import time
-import shutil
-import inspect
 
 from .errors import AccessError, VerificationError, SaveError
+from .journal import Journal
+from .codec import SaveCodec
+from .catalog import SaveCatalog, SaveInfo
+from .shards import ShardStore
+from .schema import Schema, Migration
+from .writer import SaveWriter
+from .storage import StorageBackend, FileSystemBackend
+from .snapshots import SnapshotStore
 
 from ..ConsoleControl.console import Console
 
@@ -22,7 +26,27 @@ class Preservable:
   """
   A class containing all data preservation and saving/loading functionality using cpickle serialization
   """
-  def __init__(self, save_name: str, save_path: str, save_password: Optional[str]=None, auto_save: bool=True) -> None:
+  # Attributes that only describe the in-memory save state, and so are never saved or dirty-tracked
+  TRANSIENT_ATTRIBUTES = ("_Preservable__dirty_attributes", "_Preservable__journal_length", "_Preservable__shards", "storage_backend")
+  journal_compaction_threshold = 32  # Class-level defaults, so that saves from before these options existed still load
+  background_save = False
+  save_codec = "none"
+  save_compression_level = None
+  storage_backend = FileSystemBackend()
+  schema_version = None  # Only set on classes marked as 'in development'
+  schema_fingerprint = None
+  schema_attributes = frozenset()
+  schema_defaults = {}
+  schema_migrations = {}
+
+  def __init__(
+    self, save_name: str, save_path: str, save_password: Optional[str]=None, auto_save: bool=True, 
+    journal_compaction_threshold: Optional[int]=None, background_save: Optional[bool]=None, save_codec: Optional[str]=None, save_compression_level: Optional[int]=None, 
+    storage_backend: Optional[StorageBackend]=None
+  ) -> None:
+    self.__dirty_attributes = set()
+    self.__journal_length = 0
+    self.__shards = ShardStore(self)
     self.save_name = save_name
     if save_password is None:
       self.protected_save_password = None
@@ -30,54 +54,225 @@ class Preservable:
       self.protected_save_password = self.__salt(self.__hash(save_password))
     self.save_path = "/".join(save_path.split("/"))
     self.auto_save = auto_save
+    if journal_compaction_threshold is not None:
+      self.journal_compaction_threshold = journal_compaction_threshold
+    if background_save is not None:
+      self.background_save = background_save
+    if save_codec is not None:
+      if save_codec not in SaveCodec.CODECS:
+        raise SaveError(f"Unknown save codec: {save_codec!r}") from None
+      self.save_codec = save_codec
+    if save_compression_level is not None:
+      self.save_compression_level = save_compression_level
+    if storage_backend is not None:
+      self.storage_backend = storage_backend
 
-    if not hasattr(self, "refreshable_signature"):
-      self.refreshable_signature = None
-    self.preserved_init_vars = self.__get_init_vars()
+    self.preserved_schema_version = self.schema_version
+    self.preserved_schema_fingerprint = self.schema_fingerprint
 
     self.__id = self.__salt(self.__hash(f"{self.save_name}{time.time_ns()}"))
 
     if self.auto_save:
       self.__create()
 
-  def save(self) -> None:
+  def save(self, full: bool=False) -> None:
     """
-    Save the object to a file
+    Save the object, by journaling only its dirty attributes, or by writing a full snapshot when the journal is due for compaction
     """
-    if not os.path.exists(self.save_path + f"/Save - {self.save_name}"):
-      os.makedirs(self.save_path + f"/Save - {self.save_name}")
-    
-    with open(f"{self.save_path}/Save - {self.save_name}/Save Data - {self.save_name}", 'wb') as f:
-      pickle.dump(self, f)
-  
+    if full or self.__journal_length >= self.journal_compaction_threshold or not self.storage_backend.exists(self.save_path, self.save_name, f"Save Data - {self.save_name}"):
+      self.__snapshot()
+    else:
+      if self.__dirty_attributes:
+        self.__write("append", f"Save Journal - {self.save_name}", Journal.entry(self, self.__dirty_attributes, self.__shards))
+        self.__journal_length += 1
+      self.__write_shards(changed_only=True)  # Shards are mutated in-place, so are checked for changes whether or not any attribute was flagged
+      self.__write_info()
+    self.__dirty_attributes.clear()
+
+  def save_metadata(self) -> Dict[str, Any]:
+    """
+    Returns the metadata catalogued for this save, which can be extended by child classes with any small, JSON-friendly fields
+    """
+    return {
+      "save_name": self.save_name, 
+      "types": [cls.__name__ for cls in type(self).__mro__ if issubclass(cls, Preservable)], 
+      "description": str(self) if type(self).__str__ is not object.__str__ else self.save_name, 
+      "protected": self.protected_save_password is not None, 
+      "saved_at": time.time(), 
+      "codec": self.save_codec
+    }
+
+  def __write_shards(self, changed_only: bool=False) -> None:
+    """
+    A mangled helper method to write every loaded shard (or only those changed since they were last written) to its own entry, leaving shards that were never loaded untouched
+    """
+    for key, data in self.__shards.encode_loaded(self.save_codec, self.save_compression_level, for_writing=True, changed_only=changed_only):
+      self.__write("replace", ShardStore.shard_entry(key), data)
+
+  def __write_info(self) -> None:
+    """
+    A mangled helper method to write the metadata sidecar of the save
+    """
+    self.__write("replace", SaveCatalog.info_entry(self.save_name), SaveCatalog.encode(self.save_metadata()))
+
+  @classmethod
+  def list_saves(cls, save_path: str, storage_backend: Optional[StorageBackend]=None) -> List[SaveInfo]:
+    """
+    Lists the catalogued saves made by this class (or its child classes) in a save directory, from their metadata sidecars alone
+    """
+    if storage_backend is None:
+      storage_backend = cls.storage_backend
+    saves = SaveCatalog.read_many(storage_backend, save_path, storage_backend.save_names(save_path))
+    return [save for save in saves if save is not None and save.is_instance_of(cls)]
+
   @classmethod
-  def load(cls, save_name: str, save_path: str, prompt: str="\nPlease verify your password:\t", already_verified: bool=False, additional_tests: Optional[List[Callable]]=None) -> Preservable:
+  def rebuild_catalog(cls, save_path: str, storage_backend: Optional[StorageBackend]=None) -> List[SaveInfo]:
+    """
+    Rewrites the metadata sidecar of every save in a save directory from the saves themselves, without prompting for passwords
+    """
+    if storage_backend is None:
+      storage_backend = cls.storage_backend
+    for save_name in storage_backend.save_names(save_path):
+      try:
+        preservable = Preservable.read(save_name, save_path, storage_backend=storage_backend)
+      except AccessError:
+        continue
+      storage_backend.replace(save_path, save_name, SaveCatalog.info_entry(save_name), SaveCatalog.encode(preservable.save_metadata()))
+    return cls.list_saves(save_path, storage_backend=storage_backend)
+
+  def compact(self, save_codec: Optional[str]=None, save_compression_level: Optional[int]=None) -> None:
+    """
+    Rewrites the save and all of its shards as a full snapshot, optionally with a new codec, clearing its journal
+    """
+    if save_codec is not None:
+      if save_codec not in SaveCodec.CODECS:
+        raise SaveError(f"Unknown save codec: {save_codec!r}") from None
+      self.save_codec = save_codec
+    if save_compression_level is not None:
+      self.save_compression_level = save_compression_level
+    self.__shards.load_all()
+    self.save(full=True)
+
+  def load_shards(self, *shard_keys: str) -> None:
+    """
+    Loads the given shards of the save, or every shard that is still only a proxy if none are given
+    """
+    if not shard_keys:
+      self.__shards.load_all()
+    for shard_key in shard_keys:
+      self.__shards.load(shard_key)
+
+  def loaded_shards(self) -> Dict[str, int]:
+    """
+    Maps the key of every shard loaded (or created) in this session to its encoded size when it was last read or written, which is 0 if it has not been yet
+    """
+    return {shard_key: self.__shards.sizes.get(shard_key, 0) for shard_key in self.__shards.loaded}
+
+  def unload_shard(self, shard_key: str) -> Any:
+    """
+    Writes a loaded shard to its entry if it has changed and drops it from memory, returning the proxy that must replace every reference to it so that it reloads on access
+    """
+    data = self.__shards.encode(shard_key, self.save_codec, self.save_compression_level, for_writing=True, changed_only=True)
+    if data is not None:
+      self.__write("replace", ShardStore.shard_entry(shard_key), data)
+    return self.__shards.unload(shard_key)
+
+  def snapshot(self, day: int) -> int:
+    """
+    Stores a deduplicated backup of the save's current state under a day, and returns the number of new chunks it needed
+    """
+    self.flush()
+    entries = {"Save Data": SaveCodec.encode(self, "none", persistent_id=self.__shards.persistent_id)}  # Uncompressed, so unchanged regions chunk identically between days
+    entries.update({ShardStore.shard_entry(shard_key): data for shard_key, data in self.__shards.encode_loaded("none", None)})
+    unloaded = [entry for entry in self.storage_backend.entries(self.save_path, self.save_name) if entry.startswith(ShardStore.shard_entry("")) and entry not in entries]
+    entries.update({key[2]: data for key, data in self.storage_backend.get_many([(self.save_path, self.save_name, entry) for entry in unloaded]).items() if data is not None})
+    return SnapshotStore(self.storage_backend, self.save_path, self.save_name).store(day, entries)
+
+  def list_snapshots(self) -> List[int]:
+    """
+    Lists the days that the save has snapshots for, oldest first
+    """
+    return SnapshotStore(self.storage_backend, self.save_path, self.save_name).days()
+
+  def restore(self, day: int) -> Preservable:
+    """
+    Rolls the save back to its snapshot from a day and returns the restored object, which should be used in place of this one
+    """
+    self.flush()
+    entries = SnapshotStore(self.storage_backend, self.save_path, self.save_name).load(day)
+    stale_shards = [entry for entry in self.storage_backend.entries(self.save_path, self.save_name) if entry.startswith(ShardStore.shard_entry("")) and entry not in entries]
+    self.storage_backend.put_many({(self.save_path, self.save_name, f"Save Data - {self.save_name}" if entry == "Save Data" else entry): data for entry, data in entries.items()})
+    self.storage_backend.remove(self.save_path, self.save_name, f"Save Journal - {self.save_name}")
+    for entry in stale_shards:
+      self.storage_backend.remove(self.save_path, self.save_name, entry)
+
+    restored = Preservable.read(self.save_name, self.save_path, storage_backend=self.storage_backend)
+    if restored.save_name != self.save_name:  # The save has been renamed since the snapshot was taken
+      restored.save_name = self.save_name
+    restored.upgrade_schema()
+    restored.save(full=True)  # Rewrites the restored save with its own codec and metadata
+    return restored
+
+  def prune_snapshots(self, keep_latest: int=7, keep_every: Optional[int]=None, keep_days: Iterable[int]=()) -> List[int]:
+    """
+    Removes snapshots other than the latest few, every nth day and any given days, freeing chunks no other snapshot shares
+    """
+    return SnapshotStore(self.storage_backend, self.save_path, self.save_name).prune(keep_latest, keep_every=keep_every, keep_days=keep_days)
+
+  def mark_dirty(self, *attribute_names: str) -> None:
+    """
+    Flags attributes as changed for the next save, for use when an attribute is mutated in-place rather than reassigned
+    """
+    for attribute_name in attribute_names:
+      if attribute_name not in self.__dict__:
+        raise AccessError(f"The attribute to mark as changed does not exist: {attribute_name!r}")
+      self.__dirty_attributes.add(attribute_name)
+
+  def __snapshot(self) -> None:
+    """
+    A mangled helper method to write the whole object as a snapshot, compacting away its journal
+    """
+    self.__dict__["_Preservable__save_generation"] = self.__dict__.get("_Preservable__save_generation", 0) + 1  # Orphans the old journal, even if clearing it is interrupted
+    self.__write("replace", f"Save Data - {self.save_name}", SaveCodec.encode(self, self.save_codec, self.save_compression_level, persistent_id=self.__shards.persistent_id))
+    self.__write("remove", f"Save Journal - {self.save_name}")
+    self.__write_shards()
+    self.__write_info()
+    self.__journal_length = 0
+    self.__dirty_attributes.clear()
+
+  def __write(self, operation: str, entry: str, data: Optional[bytes]=None) -> None:
     """
-    Load a previously saved object from a file
+    A mangled helper method to carry out a write to an entry of the save, either directly or through the background writer of the save
     """
-    preservable = cls.__load(save_name, save_path, prompt, already_verified, additional_tests)
-    try:
-      if cls.refreshable_signature is not None:
-        preservable.__refresh()
-    except AttributeError:
-      pass
+    data = [] if data is None else [data]
+    if self.background_save:
+      getattr(SaveWriter.for_save(self.storage_backend, self.save_path, self.save_name), operation)(entry, *data)
+    else:
+      getattr(self.storage_backend, operation)(self.save_path, self.save_name, entry, *data)
 
-    if preservable.auto_save:
-      preservable.save()
+  def flush(self) -> None:
+    """
+    Blocks until every background write of this object's save has finished
+    """
+    SaveWriter.flush_save(self.storage_backend, self.save_path, self.save_name)
+  
+  @classmethod
+  def load(cls, save_name: str, save_path: str, prompt: str="\nPlease verify your password:\t", already_verified: bool=False, additional_tests: Optional[List[Callable]]=None, storage_backend: Optional[StorageBackend]=None) -> Preservable:
+    """
+    Load a previously saved object from storage
+    """
+    preservable = cls.__load(save_name, save_path, prompt, already_verified, additional_tests, storage_backend)
+    preservable.upgrade_schema()
     return preservable
 
   @classmethod
-  def __load(cls, save_name: str, save_path: str, prompt: str, already_verified: bool, additional_tests: Optional[List[Callable]]) -> Preservable:
+  def __load(cls, save_name: str, save_path: str, prompt: str, already_verified: bool, additional_tests: Optional[List[Callable]], storage_backend: Optional[StorageBackend]) -> Preservable:
     """
-    A mangled helper method to load pickled data from a file
+    A mangled helper method to load pickled data from storage
     """
     if additional_tests is None:
       additional_tests = []
-    if os.path.exists(f"{save_path}/Save - {save_name}/Save Data - {save_name}"):
-      with open(f"{save_path}/Save - {save_name}/Save Data - {save_name}", 'rb') as f:
-        preservable = pickle.load(f)
-    else:
-      raise AccessError("That Save Does Not Exist") from None
+    preservable = cls.read(save_name, save_path, storage_backend=storage_backend or cls.storage_backend)
     
     for assertion, fail_message in additional_tests:
       try:
@@ -94,36 +289,62 @@ class Preservable:
       return preservable
     raise VerificationError() from None
   
-  def __get_init_vars(self) -> Set[str]:
+  @staticmethod
+  def read(save_name: str, save_path: str, storage_backend: Optional[StorageBackend]=None) -> Preservable:
     """
-    A mangled helper method to scan and retrieve some changed __init__ source code since the last save
+    Reads a save's snapshot and replays its journal, without any access checks or upgrades, for use by offline tools
     """
-    init_vars = []
-    for line in inspect.getsource(self.__init__).splitlines()[1:]:
-      try:
-        if ((split_line := [part for part in line.split(" ") if part])[0].startswith("self.") and split_line[1] == "="):
-          init_vars.append(line)
-      except IndexError:
-        continue
-    return set(init_vars)
+    if storage_backend is None:
+      storage_backend = Preservable.storage_backend
+    SaveWriter.flush_save(storage_backend, save_path, save_name)
+    data, journal = storage_backend.get_many([(save_path, save_name, f"Save Data - {save_name}"), (save_path, save_name, f"Save Journal - {save_name}")]).values()
+    if data is None:
+      raise AccessError("That Save Does Not Exist") from None
 
-  def __refresh(self) -> None:
+    shards = ShardStore(None)  # Shards are only referred to by proxies until they are first accessed
+    preservable = SaveCodec.decode(data, persistent_load=shards.persistent_load)
+    shards.owner = preservable
+    preservable.__shards = shards
+    if journal is not None:
+      preservable.__journal_length, valid_length = Journal.replay(journal, preservable, shards)
+      if valid_length < len(journal):  # Discard a partially written final entry, so that later entries stay readable
+        storage_backend.replace(save_path, save_name, f"Save Journal - {save_name}", journal[:valid_length])
+    if preservable.save_path != save_path:  # The save has been moved since it was written
+      preservable.save_path = save_path
+    preservable.storage_backend = storage_backend
+    return preservable
+  
+  def upgrade_schema(self) -> bool:
     """
-    A mangled helper method to carry out the execution of refeshing an old class with newly added variables in the __init__ method
+    Applies the registered migrations to bring an old save up to its class's current schema version, then gives it any newly declared attributes that a fresh instance starts with, and returns whether anything changed
     """
-    current_init_vars = self.__get_init_vars()
-    new_init_vars = [line.lstrip() for line in current_init_vars - self.preserved_init_vars]
-    for line in new_init_vars:
-      try:
-        exec(line)  # Safe unless code infiltrated, in which case there is no hope anyway...
-      except Exception:
-        raise SaveError("This save is out of date, and a new version of the save template has been created, which is nt backwards-compatible") from None
-    self.preserved_init_vars = current_init_vars
+    if self.schema_version is None or self.__dict__.get("preserved_schema_fingerprint") == self.schema_fingerprint:  # Fast path for up-to-date saves
+      return False
+    
+    saved_version = self.__dict__.get("preserved_schema_version") or 1  # Saves from before schemas existed count as the first version
+    if saved_version > self.schema_version:
+      raise SaveError(f"This save was made by a newer version of its save template (schema version {saved_version})") from None
+    for version in range(saved_version, self.schema_version):
+      if version in self.schema_migrations:  # Versions without a migration are upgraded by the default step below alone
+        self.schema_migrations.get(version)(self)
+
+    unresolved_attributes = []
+    for attribute_name in sorted(self.schema_attributes - set(self.__dict__)):
+      if attribute_name in self.schema_defaults:
+        setattr(self, attribute_name, self.schema_defaults.get(attribute_name)())
+      elif not hasattr(type(self), attribute_name):  # A class-level default already covers the attribute
+        unresolved_attributes.append(attribute_name)
+    if unresolved_attributes:
+      raise SaveError(f"This save is out of date, and needs a migration to set attributes the save template now requires that have no constant default, such as renamed attributes: {', '.join(unresolved_attributes)}") from None
+    self.preserved_schema_version = self.schema_version
+    self.preserved_schema_fingerprint = self.schema_fingerprint
+    return True
 
   def edit_save_name(self, new_name: str, already_verified: bool=False, prompt: str="\nPlease verify your current save name:\t") -> None:
     """
     Changes and updates the save name in the file and class with verification
     """
+    self.__shards.load_all()  # Shards are only carried over to the new save if they are loaded
     old_name = self.save_name
     if already_verified or self.protected_save_password is None:
       self.save_name = new_name
@@ -134,6 +355,8 @@ class Preservable:
         raise VerificationError() from None
     
     self.__create()
+    snapshot_entries = [(self.save_path, old_name, entry) for entry in self.storage_backend.entries(self.save_path, old_name) if entry.startswith((SnapshotStore.MANIFEST_PREFIX, SnapshotStore.CHUNK_PREFIX))]
+    self.storage_backend.put_many({(self.save_path, self.save_name, key[2]): data for key, data in self.storage_backend.get_many(snapshot_entries).items() if data is not None})  # Snapshots follow the save to its new name
     self.delete(name_override=old_name, already_verified=already_verified)
 
     if self.auto_save:
@@ -164,6 +387,7 @@ class Preservable:
           setattr(self, attribute_name, attribute_value)
         else:
           set_sequence(getattr(self, attribute_name), attribute_value)
+          self.mark_dirty(attribute_name)
       except AttributeError:
         raise AccessError("The requested saved attribute to edit does not exist")
     else:
@@ -210,12 +434,9 @@ class Preservable:
     """
     A mangled helper method to create (or re-create) the saved files
     """
-    if os.path.exists(self.save_path + f"/Save - {self.save_name}/Save Data - {self.save_name}"):
+    if self.storage_backend.exists(self.save_path, self.save_name, f"Save Data - {self.save_name}"):
       raise SaveError("Save Already Exists") from None
-    os.makedirs(self.save_path + f"/Save - {self.save_name}")
-    
-    with open(f"{self.save_path}/Save - {self.save_name}/Save Data - {self.save_name}", 'wb') as f:
-      pickle.dump(self, f)
+    self.__snapshot()
   
   def delete(self, name_override: Optional[str]=None, already_verified: bool=False, prompt: str="\nPlease verify your password:\t") -> None:
     """
@@ -223,11 +444,12 @@ class Preservable:
     """
     if name_override is None:
       name_override = self.save_name
+    SaveWriter.flush_save(self.storage_backend, self.save_path, name_override)
     if already_verified or self.protected_save_password is None:
-      shutil.rmtree(self.save_path + f"/Save - {name_override}")
+      self.storage_backend.delete_save(self.save_path, name_override)
     else:
       if self.verify_password(Console.get_input(prompt, cover_character="*", input_zone=True)):
-        shutil.rmtree(self.save_path + f"/Save - {name_override}")
+        self.storage_backend.delete_save(self.save_path, name_override)
       else:
         raise VerificationError() from None
 
@@ -243,17 +465,50 @@ class Preservable:
     """
     return _input + sha256(_input).digest()
 
+  def __setattr__(self, name: str, value: Any) -> None:
+    """
+    Override the builtin __setattr__ to flag reassigned attributes as dirty for the next save
+    """
+    super().__setattr__(name, value)
+    if name not in Preservable.TRANSIENT_ATTRIBUTES and "_Preservable__dirty_attributes" in self.__dict__:
+      self.__dirty_attributes.add(name)
+
+  def __getstate__(self) -> Dict[str, Any]:
+    """
+    Override the builtin __getstate__ to leave the transient save state out of the pickled data
+    """
+    return {name: value for name, value in self.__dict__.items() if name not in Preservable.TRANSIENT_ATTRIBUTES}
+
+  def __setstate__(self, state: Dict[str, Any]) -> None:
+    """
+    Override the builtin __setstate__ to restore the pickled data with a fresh transient save state
+    """
+    self.__dict__.update(state)
+    self.__dict__.update({"_Preservable__dirty_attributes": set(), "_Preservable__journal_length": 0, "_Preservable__shards": ShardStore(self)})
+
   def __eq__(self, other: Any) -> bool:
     """
     Override the builtin __eq__ to check for preservable object equality
     """
     return (self.__id == other.__id) and (type(self) is type(other))
 
-  def in_development() -> Callable:
+  def in_development(version: int=1) -> Callable:
     """
-    A decorator to mark preservable classes as 'in development', so the program can attempt to update old saves with new additions to the class automatically
+    A decorator to mark preservable classes as 'in development' at a schema version, so old saves are upgraded on load through the class's migrations, and given the defaults of newly added attributes
     """
     def _class(unrefreshable_class):
-      setattr(unrefreshable_class, "refreshable_signature", unrefreshable_class)
+      unrefreshable_class.schema_version = version
+      unrefreshable_class.schema_attributes = Schema.init_attributes(unrefreshable_class)  # Computed once, at class-definition time
+      unrefreshable_class.schema_fingerprint = f"{version}:{Schema.fingerprint(unrefreshable_class.schema_attributes)}"
+      unrefreshable_class.schema_defaults = Schema.init_defaults(unrefreshable_class)
+      unrefreshable_class.schema_migrations = Schema.migrations(unrefreshable_class)
       return unrefreshable_class
     return _class
+
+  def migration(from_version: int) -> Callable:
+    """
+    A decorator for converting a user-defined method into a migration, which upgrades saves from the given schema version to the next
+    """
+    def _migration(method):
+      return Migration(method, from_version)
+    return _migration
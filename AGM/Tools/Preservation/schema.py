@@ -0,0 +1,92 @@
+"""
+A collection of tools for preservable class schemas, which let old saves be upgraded to newer versions of their class
+"""
+
+
+from typing import Any, Callable, Dict, FrozenSet
+
+from hashlib import sha256
+import dis
+import inspect
+
+
+class Migration:
+  """
+  A wrapper containing all the necessary data for a schema migration, which upgrades a save from one schema version to the next
+  """
+  def __init__(self, method: Callable, from_version: int) -> None:
+    self.method = method
+    self.from_version = from_version
+
+  def __call__(self, preservable: object) -> None:
+    self.method(preservable)
+
+
+class Schema:
+  """
+  A static class to compute preservable class schemas from bytecode, so that no source code is read at runtime
+  """
+  @staticmethod
+  def init_attributes(preservable_class: type) -> FrozenSet[str]:
+    """
+    Scans the bytecode of a class's own __init__ method for the names of every attribute it assigns on self
+    """
+    init = preservable_class.__dict__.get("__init__")
+    if init is None:
+      return frozenset()
+    self_name = init.__code__.co_varnames[0]
+    attributes = set()
+    previous = None
+    for instruction in dis.get_instructions(init):
+      if instruction.opname == "STORE_ATTR" and previous is not None and previous.opname.startswith("LOAD_FAST"):
+        loaded_names = previous.argval if isinstance(previous.argval, tuple) else (previous.argval, )  # Newer interpreters can load two locals at once
+        if loaded_names[-1] == self_name:
+          attributes.add(instruction.argval)
+      previous = instruction
+    return frozenset(attributes)
+
+  @staticmethod
+  def init_defaults(preservable_class: type) -> Dict[str, Callable[[], Any]]:
+    """
+    Scans the bytecode of a class's own __init__ method for the attributes it always assigns a constant or an empty container, returning a factory for the value each starts with in a fresh instance
+    """
+    init = preservable_class.__dict__.get("__init__")
+    if init is None:
+      return {}
+    self_name = init.__code__.co_varnames[0]
+    empty_containers = {"BUILD_LIST": list, "BUILD_MAP": dict, "BUILD_SET": set}
+    defaults = {}
+    conflicting = set()
+    instructions = list(dis.get_instructions(init))
+    for value, target, store in zip(instructions, instructions[1:], instructions[2:]):
+      if store.opname != "STORE_ATTR" or not target.opname.startswith("LOAD_FAST") or target.argval != self_name:
+        continue
+      if value.opname in ("LOAD_CONST", "LOAD_SMALL_INT"):
+        default = ("constant", value.argval)
+      elif value.opname in empty_containers and value.arg == 0:
+        default = ("container", value.opname)
+      else:
+        default = None  # Assigned from an argument or an expression, which only the constructor can evaluate
+      if store.argval in defaults and defaults.get(store.argval) != default:
+        conflicting.add(store.argval)
+      defaults[store.argval] = default
+    for name in conflicting:  # Assigned differently on different branches, so there is no single default
+      defaults[name] = None
+    return {
+      name: (lambda value=default[1]: value) if default[0] == "constant" else empty_containers.get(default[1])
+      for name, default in defaults.items() if default is not None
+    }
+
+  @staticmethod
+  def fingerprint(attributes: FrozenSet[str]) -> str:
+    """
+    Generates a short, stable fingerprint of a set of attribute names
+    """
+    return sha256("\n".join(sorted(attributes)).encode()).hexdigest()[:16]
+
+  @staticmethod
+  def migrations(preservable_class: type) -> Dict[int, Migration]:
+    """
+    Gathers the user-defined migrations of a class, keyed by the schema version that each upgrades from
+    """
+    return {migration.from_version: migration for _, migration in inspect.getmembers(preservable_class, predicate=lambda member: isinstance(member, Migration))}
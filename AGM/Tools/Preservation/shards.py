@@ -0,0 +1,271 @@
+"""
+A collection of tools allowing parts of a preservable object's graph to be saved in separate shards, and loaded lazily on first access
+"""
+
+
+from __future__ import annotations
+from typing import Any, Dict, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from abc import ABC, abstractmethod
+
+from .errors import AccessError
+from .journal import ATOMIC_TYPES
+from .codec import SaveCodec
+from .writer import SaveWriter
+
+if TYPE_CHECKING:
+  from .preservable import Preservable
+
+
+class Shardable:
+  """
+  A mixin for objects that are saved in their own shard, separately from the preservable object that owns them
+  """
+  def shard_key(self) -> str:
+    """
+    Returns the unique key of this object's shard, which is its name by default
+    """
+    return self.name
+
+  def resolve_shard_member(self, path: Tuple[str, ...]) -> Any:
+    """
+    Fetches a member object of this shard from its path, as returned by that member's shard_member_path method
+    """
+    raise AccessError(f"Shard {self.shard_key()!r} has no member at {path!r}")
+
+
+class ShardMember(ABC):
+  """
+  A mixin for objects that are saved inside the shard of another object, so that references to them from elsewhere can be kept by path
+  """
+  @abstractmethod
+  def shard_owner(self) -> Shardable:
+    """
+    Returns the object whose shard this object is saved in
+    """
+
+  @abstractmethod
+  def shard_member_path(self) -> Tuple[str, ...]:
+    """
+    Returns the path of this object within its owner's shard
+    """
+
+
+class ShardProxy:
+  """
+  A lightweight stand-in for a shard (or a member of one) that has not been loaded yet, which loads it on first attribute access
+  """
+  __slots__ = ("_store", "_key", "_path")
+
+  def __init__(self, store: ShardStore, key: str, path: Optional[Tuple[str, ...]]=None) -> None:
+    object.__setattr__(self, "_store", store)
+    object.__setattr__(self, "_key", key)
+    object.__setattr__(self, "_path", path)
+
+  def shard_key(self) -> str:
+    """
+    Returns the key of the shard this proxy belongs to, without loading it
+    """
+    return self._key
+
+  def resolve(self) -> Any:
+    """
+    Loads the shard if needed, and returns the real object this proxy stands in for
+    """
+    shard = self._store.load(self._key)
+    if self._path is None:
+      return shard
+    return shard.resolve_shard_member(self._path)
+
+  @staticmethod
+  def unwrap(obj: Any) -> Any:
+    """
+    Returns the real object behind a proxy, or the object itself if it is not a proxy
+    """
+    if isinstance(obj, ShardProxy):
+      return obj.resolve()
+    return obj
+
+  def __getattr__(self, name: str) -> Any:
+    return getattr(self.resolve(), name)
+
+  def __setattr__(self, name: str, value: Any) -> None:
+    setattr(self.resolve(), name, value)
+
+  def __eq__(self, other: Any) -> bool:
+    return self.resolve() == ShardProxy.unwrap(other)
+
+  def __hash__(self) -> int:
+    return hash(self.resolve())
+
+  def __str__(self) -> str:
+    return str(self.resolve())
+
+  def __repr__(self) -> str:
+    return f"<ShardProxy {self._key!r}{'' if self._path is None else ' ' + '/'.join(self._path)}>"
+
+
+class ShardReference:
+  """
+  A descriptor for an attribute that may refer to a shard (or a member of one) saved elsewhere, which swaps a proxy for the real object on first access so that identity checks and isinstance work on it
+  """
+  def __init__(self, name: Optional[str]=None) -> None:
+    self.name = name
+
+  def __set_name__(self, owner: type, name: str) -> None:
+    """
+    Takes the name of the attribute from the class it is declared on, unless one was given
+    """
+    if self.name is None:
+      self.name = name
+
+  def __get__(self, obj: Any, owner: Optional[type]=None) -> Any:
+    """
+    Returns the attribute's value, loading its shard and storing the real object in place of a proxy if needed
+    """
+    if obj is None:
+      return self
+    try:
+      value = obj.__dict__[self.name]
+    except KeyError:
+      raise AttributeError(f"{type(obj).__name__!r} object has no attribute {self.name!r}") from None
+    if isinstance(value, ShardProxy):
+      value = obj.__dict__[self.name] = value.resolve()  # Stored directly, as swapping in the loaded object is not a change
+    return value
+
+  def __set__(self, obj: Any, value: Any) -> None:
+    """
+    Sets the attribute's value, leaving a proxy unloaded until the attribute is next read
+    """
+    obj.__dict__[self.name] = value
+
+
+class ShardStore:
+  """
+  The registry of the shards owned by a single preservable object, which tracks which are loaded and maps them to and from persistent IDs
+  """
+  def __init__(self, owner: Preservable) -> None:
+    self.owner = owner
+    self.loaded: Dict[str, Shardable] = {}
+    self.proxies: Dict[str, ShardProxy] = {}
+    self.sizes: Dict[str, int] = {}  # The encoded size of each shard when it was last read or written, as a cheap measure of its footprint
+    self.digests: Dict[str, bytes] = {}  # A digest of each shard's uncompressed contents when it was last written, so that unchanged shards are not rewritten
+
+  @staticmethod
+  def shard_entry(key: str) -> str:
+    """
+    Returns the name of a shard's entry within the owner's save
+    """
+    return f"Save Shard - {key}"
+
+  def is_loaded(self, key: str) -> bool:
+    """
+    Checks whether a shard has been loaded (or created) in this session
+    """
+    return key in self.loaded
+
+  def load(self, key: str) -> Shardable:
+    """
+    Loads a shard from storage if it is not already loaded, and returns it
+    """
+    if key not in self.loaded:
+      SaveWriter.flush_save(self.owner.storage_backend, self.owner.save_path, self.owner.save_name)
+      data = self.owner.storage_backend.read(self.owner.save_path, self.owner.save_name, self.shard_entry(key))
+      if data is None:
+        raise AccessError(f"The shard {key!r} of this save does not exist") from None
+      self.loaded[key] = SaveCodec.decode(data, persistent_load=self.persistent_load)
+      self.sizes[key] = len(data)
+    return self.loaded.get(key)
+
+  def unload(self, key: str) -> ShardProxy:
+    """
+    Drops a loaded shard from memory, and returns the proxy that stands in for it until it is next loaded
+    """
+    self.loaded.pop(key, None)
+    self.sizes.pop(key, None)
+    return self.proxies.setdefault(key, ShardProxy(self, key))
+
+  def load_all(self) -> None:
+    """
+    Loads every shard that is still only a proxy, for use before the save is moved
+    """
+    for key in list(self.proxies):
+      self.load(key)
+
+  def persistent_id(self, obj: Any, root: Any=None, references: Optional[Dict[int, tuple]]=None) -> Optional[tuple]:
+    """
+    Maps an object being pickled to a persistent ID if it is the owner, one of the owner's attributes, a shard or a shard member, and registers newly seen shards
+    """
+    if obj is root:
+      return None
+    if references is not None and id(obj) in references:
+      return references.get(id(obj))
+    if isinstance(obj, ShardProxy):
+      return ("shard", obj._key) if obj._path is None else ("member", obj._key, obj._path)
+    if isinstance(obj, Shardable):
+      self.loaded.setdefault(obj.shard_key(), obj)
+      return ("shard", obj.shard_key())
+    if isinstance(obj, ShardMember):
+      owner = obj.shard_owner()
+      if owner is not root:
+        return ("member", self.persistent_id(owner)[1], obj.shard_member_path())
+    return None
+
+  def persistent_load(self, pid: tuple) -> Any:
+    """
+    Resolves a persistent ID written by persistent_id, creating proxies for any shards that are not loaded yet
+    """
+    if pid[0] == "self":
+      return self.owner
+    if pid[0] == "attribute":
+      return self.owner.__dict__[pid[1]]
+    if pid[0] == "shard":
+      if pid[1] in self.loaded:
+        return self.loaded.get(pid[1])
+      return self.proxies.setdefault(pid[1], ShardProxy(self, pid[1]))
+    if pid[0] == "member":
+      if pid[1] in self.loaded:
+        return self.loaded.get(pid[1]).resolve_shard_member(pid[2])
+      return ShardProxy(self, pid[1], pid[2])
+    raise AccessError(f"Unrecognised persistent reference in save: {pid!r}")
+
+  def owner_references(self) -> Dict[int, tuple]:
+    """
+    Maps the owner and each of its non-atomic attributes to persistent IDs, so that shards refer to them rather than copying them
+    """
+    references = {id(value): ("attribute", name) for name, value in self.owner.__getstate__().items() if not isinstance(value, ATOMIC_TYPES)}
+    references[id(self.owner)] = ("self", )
+    return references
+
+  def encode(self, key: str, codec: str, level: Optional[int], references: Optional[Dict[int, tuple]]=None, for_writing: bool=False, changed_only: bool=False) -> Optional[bytes]:
+    """
+    Encodes a single loaded shard, recording its encoded size, and (when it is encoded to be written to its entry) its digest, returning None if only changed shards are wanted and it is unchanged
+    """
+    if key not in self.loaded:
+      raise AccessError(f"The shard {key!r} of this save is not loaded") from None
+    references = self.owner_references() if references is None else references
+    shard = self.loaded.get(key)
+    data = SaveCodec.encode(shard, "none", persistent_id=lambda obj: self.persistent_id(obj, root=shard, references=references))  # Compressed only once it is known to be needed
+    digest = SaveCodec.checksum_of(data)
+    if changed_only and self.digests.get(key) == digest:
+      return None
+    if for_writing:
+      self.digests[key] = digest
+    data = SaveCodec.recode(data, codec, level)
+    self.sizes[key] = len(data)
+    return data
+
+  def encode_loaded(self, codec: str, level: Optional[int], for_writing: bool=False, changed_only: bool=False) -> Iterator[Tuple[str, bytes]]:
+    """
+    Encodes every loaded shard (or only those changed since they were last written), including any shards first seen while encoding the others
+    """
+    references = self.owner_references()
+    encoded = set()
+    while len(encoded) < len(self.loaded):
+      for key in list(self.loaded):
+        if key in encoded:
+          continue
+        encoded.add(key)
+        data = self.encode(key, codec, level, references=references, for_writing=for_writing, changed_only=changed_only)
+        if data is not None:
+          yield key, data
@@ -0,0 +1,135 @@
+"""
+A content-addressed snapshot store, which keeps rolling backups of a save as deduplicated chunks shared between snapshots
+"""
+
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from hashlib import sha256
+import json
+import re
+import time
+import zlib
+
+from .errors import AccessError
+from .storage import StorageBackend
+
+
+# Content-defined chunking parameters, so that an edit only changes the chunks around it rather than shifting every later chunk
+MIN_CHUNK_SIZE = 2 * 1024
+MAX_CHUNK_SIZE = 64 * 1024
+CUT_ANCHORS = re.compile(rb"[\x07\x87]")  # Only the bytes after these values can end a chunk, so candidates are found by the regex engine rather than a byte-by-byte loop
+CUT_WINDOW = 32  # Whether an anchor ends a chunk only depends on the 32 bytes up to it
+CUT_MASK = (1 << 6) - 1  # One anchor in 64 ends a chunk, for around 8-12KiB chunks past the minimum
+
+
+class SnapshotStore:
+  """
+  A wrapper around the snapshot entries of a single save, storing each snapshot as a manifest of shared, content-addressed chunks
+  """
+  MANIFEST_PREFIX = "Snapshot - Day "
+  CHUNK_PREFIX = "Snapshot Chunk - "
+
+  def __init__(self, backend: StorageBackend, save_path: str, save_name: str) -> None:
+    self.backend = backend
+    self.save_path = save_path
+    self.save_name = save_name
+
+  @staticmethod
+  def chunk(data: bytes) -> List[memoryview]:
+    """
+    Splits data into content-defined chunks, ending them at anchor bytes whose preceding window has a CRC with its low bits clear
+    """
+    view = memoryview(data)
+    chunks = []
+    start = 0
+    while start < len(view):
+      end = min(start + MAX_CHUNK_SIZE, len(view))
+      cut = end
+      for anchor in CUT_ANCHORS.finditer(view, start + MIN_CHUNK_SIZE - 1, end):  # Bytes before the minimum size can never end a chunk
+        if not zlib.crc32(view[anchor.end() - CUT_WINDOW:anchor.end()]) & CUT_MASK:
+          cut = anchor.end()
+          break
+      chunks.append(view[start:cut])
+      start = cut
+    return chunks
+
+  def days(self) -> List[int]:
+    """
+    Lists the days of every stored snapshot, oldest first
+    """
+    return sorted(int(entry[len(self.MANIFEST_PREFIX):]) for entry in self.backend.entries(self.save_path, self.save_name) if entry.startswith(self.MANIFEST_PREFIX))
+
+  def store(self, day: int, entries: Dict[str, bytes]) -> int:
+    """
+    Stores a snapshot of the given save entries under a day, replacing any snapshot already on that day, and returns the number of new chunks written
+    """
+    existing_chunks = {entry for entry in self.backend.entries(self.save_path, self.save_name) if entry.startswith(self.CHUNK_PREFIX)}
+    manifest = {"day": day, "created": time.time(), "entries": {}}
+    new_chunks = {}
+    for entry, data in entries.items():
+      digests = []
+      for chunk in self.chunk(data):
+        digest = sha256(chunk).hexdigest()
+        digests.append(digest)
+        if f"{self.CHUNK_PREFIX}{digest}" not in existing_chunks:
+          new_chunks[(self.save_path, self.save_name, f"{self.CHUNK_PREFIX}{digest}")] = zlib.compress(chunk, 1)
+      manifest["entries"][entry] = digests
+    self.backend.put_many(new_chunks)  # Chunks are written before the manifest, so an interruption only leaves unreferenced chunks
+    self.backend.replace(self.save_path, self.save_name, self.__manifest_entry(day), json.dumps(manifest).encode())
+    return len(new_chunks)
+
+  def load(self, day: int) -> Dict[str, bytes]:
+    """
+    Reassembles the save entries stored in the snapshot of a day
+    """
+    manifest = self.__read_manifest(day)
+    if manifest is None:
+      raise AccessError(f"There is no snapshot of this save on day {day}") from None
+    digests = {digest for chunk_digests in manifest["entries"].values() for digest in chunk_digests}
+    chunks = self.backend.get_many([(self.save_path, self.save_name, f"{self.CHUNK_PREFIX}{digest}") for digest in digests])
+    chunks = {key[2][len(self.CHUNK_PREFIX):]: data for key, data in chunks.items()}
+    if any(data is None for data in chunks.values()):
+      raise AccessError(f"The snapshot of this save on day {day} is missing some of its chunks") from None
+    return {entry: b"".join(zlib.decompress(chunks.get(digest)) for digest in chunk_digests) for entry, chunk_digests in manifest["entries"].items()}
+
+  def prune(self, keep_latest: int, keep_every: Optional[int]=None, keep_days: Iterable[int]=()) -> List[int]:
+    """
+    Removes snapshots outside of the retention policy and then collects their unshared chunks, returning the days removed
+    """
+    days = self.days()
+    kept = set(days[-keep_latest:] if keep_latest > 0 else []) | set(keep_days)
+    if keep_every is not None:
+      kept |= {day for day in days if day % keep_every == 0}
+    removed = [day for day in days if day not in kept]
+    for day in removed:
+      self.backend.remove(self.save_path, self.save_name, self.__manifest_entry(day))
+    self.collect_garbage()
+    return removed
+
+  def collect_garbage(self) -> int:
+    """
+    Removes every chunk that no remaining snapshot refers to, and returns the number removed
+    """
+    referenced: Set[str] = set()
+    for day in self.days():
+      manifest = self.__read_manifest(day)
+      if manifest is not None:
+        referenced |= {digest for chunk_digests in manifest["entries"].values() for digest in chunk_digests}
+    unreferenced = [entry for entry in self.backend.entries(self.save_path, self.save_name) if entry.startswith(self.CHUNK_PREFIX) and entry[len(self.CHUNK_PREFIX):] not in referenced]
+    for entry in unreferenced:
+      self.backend.remove(self.save_path, self.save_name, entry)
+    return len(unreferenced)
+
+  def __manifest_entry(self, day: int) -> str:
+    """
+    A mangled helper method to get the name of a snapshot's manifest entry, zero-padded so entries sort by day
+    """
+    return f"{self.MANIFEST_PREFIX}{day:06d}"
+
+  def __read_manifest(self, day: int) -> Optional[dict]:
+    """
+    A mangled helper method to read and parse a snapshot's manifest
+    """
+    data = self.backend.read(self.save_path, self.save_name, self.__manifest_entry(day))
+    return None if data is None else json.loads(data)
@@ -0,0 +1,243 @@
+"""
+A collection of storage backends, which hold the entries (data, journal, shards and metadata) of every save
+"""
+
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from abc import ABC, abstractmethod
+import os
+import shutil
+import sqlite3
+import threading
+
+from .writer import write_atomic, append_synced, remove_file
+
+
+class StorageBackend(ABC):
+  """
+  An abstract base class for save storage, in which each save is addressed by its save path and name, and holds named binary entries
+  """
+  @abstractmethod
+  def location(self, save_path: str, save_name: str) -> str:
+    """
+    Returns a string uniquely identifying a save within this backend
+    """
+
+  @abstractmethod
+  def read(self, save_path: str, save_name: str, entry: str) -> Optional[bytes]:
+    """
+    Reads an entry of a save, returning None if it does not exist
+    """
+
+  @abstractmethod
+  def replace(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    """
+    Atomically replaces (or creates) an entry of a save
+    """
+
+  @abstractmethod
+  def append(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    """
+    Appends data onto the end of an entry of a save, creating it if it does not exist
+    """
+
+  @abstractmethod
+  def remove(self, save_path: str, save_name: str, entry: str) -> None:
+    """
+    Removes an entry of a save if it exists
+    """
+
+  def exists(self, save_path: str, save_name: str, entry: str) -> bool:
+    """
+    Checks whether an entry of a save exists
+    """
+    return self.read(save_path, save_name, entry) is not None
+
+  @abstractmethod
+  def entries(self, save_path: str, save_name: str) -> List[str]:
+    """
+    Lists the names of every entry of a save
+    """
+
+  @abstractmethod
+  def save_names(self, save_path: str) -> List[str]:
+    """
+    Lists the names of every save directly within a save path
+    """
+
+  @abstractmethod
+  def saves(self, save_root: str) -> List[Tuple[str, str]]:
+    """
+    Lists the save path and name of every save within a save root, at any depth
+    """
+
+  @abstractmethod
+  def delete_save(self, save_path: str, save_name: str) -> None:
+    """
+    Deletes a save and every one of its entries
+    """
+
+  def get_many(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Optional[bytes]]:
+    """
+    Reads many entries at once, each given by its save path, save name and entry name
+    """
+    return {key: self.read(*key) for key in keys}
+
+  def put_many(self, items: Dict[Tuple[str, str, str], bytes]) -> None:
+    """
+    Replaces many entries at once, each given by its save path, save name and entry name
+    """
+    for key, data in items.items():
+      self.replace(*key, data)
+
+
+class FileSystemBackend(StorageBackend):
+  """
+  The default storage backend, which keeps each save as a directory, and each entry as a file within it
+  """
+  def location(self, save_path: str, save_name: str) -> str:
+    return f"{save_path}/Save - {save_name}"
+
+  def read(self, save_path: str, save_name: str, entry: str) -> Optional[bytes]:
+    try:
+      with open(f"{self.location(save_path, save_name)}/{entry}", 'rb') as f:
+        return f.read()
+    except FileNotFoundError:
+      return None
+
+  def replace(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    write_atomic(f"{self.location(save_path, save_name)}/{entry}", data)
+
+  def append(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    append_synced(f"{self.location(save_path, save_name)}/{entry}", data)
+
+  def remove(self, save_path: str, save_name: str, entry: str) -> None:
+    remove_file(f"{self.location(save_path, save_name)}/{entry}")
+
+  def exists(self, save_path: str, save_name: str, entry: str) -> bool:
+    return os.path.exists(f"{self.location(save_path, save_name)}/{entry}")
+
+  def entries(self, save_path: str, save_name: str) -> List[str]:
+    if not os.path.isdir(self.location(save_path, save_name)):
+      return []
+    return sorted(entry for entry in os.listdir(self.location(save_path, save_name)) if not entry.endswith(".tmp"))
+
+  def save_names(self, save_path: str) -> List[str]:
+    if not os.path.isdir(save_path):
+      return []
+    return sorted(entry[len("Save - "):] for entry in os.listdir(save_path) if entry.startswith("Save - ") and os.path.isdir(f"{save_path}/{entry}"))
+
+  def saves(self, save_root: str) -> List[Tuple[str, str]]:
+    saves = []
+    for directory, subdirectories, _ in os.walk(save_root):
+      for subdirectory in subdirectories:
+        save_name = subdirectory[len("Save - "):]
+        if subdirectory.startswith("Save - ") and os.path.exists(f"{directory}/{subdirectory}/Save Data - {save_name}"):
+          saves.append((directory, save_name))
+    return sorted(saves)
+
+  def delete_save(self, save_path: str, save_name: str) -> None:
+    shutil.rmtree(self.location(save_path, save_name))
+
+
+class SQLiteBackend(StorageBackend):
+  """
+  A storage backend that keeps every entry of every save as a row in a single SQLite database, avoiding per-save directories
+  """
+  _connections: Dict[Tuple[str, int], sqlite3.Connection] = {}
+  _lock = threading.RLock()  # Serializes use of the shared connections between the game thread and background save writers
+  BULK_CHUNK_SIZE = 300  # Keeps bulk statements within SQLite's bound-parameter limit
+
+  def __init__(self, database_path: str) -> None:
+    self.database_path = database_path
+
+  def __getstate__(self) -> Dict[str, str]:
+    """
+    Override the builtin __getstate__ so that only the database path is pickled, never a connection
+    """
+    return {"database_path": self.database_path}
+
+  def connection(self) -> sqlite3.Connection:
+    """
+    Fetches this process's connection to the database, opening it in WAL mode on first use
+    """
+    key = (os.path.abspath(self.database_path), os.getpid())  # Connections cannot be shared with forked processes
+    with self._lock:
+      if key not in self._connections:
+        connection = sqlite3.connect(self.database_path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (save_path TEXT NOT NULL, save_name TEXT NOT NULL, entry TEXT NOT NULL, data BLOB NOT NULL, PRIMARY KEY (save_path, save_name, entry)) WITHOUT ROWID")
+        self._connections[key] = connection
+      return self._connections.get(key)
+
+  def __execute(self, sql: str, parameters: tuple=()) -> List[tuple]:
+    """
+    A mangled helper method to run a single statement on the shared connection, serialized between threads
+    """
+    with self._lock:
+      return self.connection().execute(sql, parameters).fetchall()
+
+  def location(self, save_path: str, save_name: str) -> str:
+    return f"{self.database_path}:{save_path}/Save - {save_name}"
+
+  def read(self, save_path: str, save_name: str, entry: str) -> Optional[bytes]:
+    rows = self.__execute("SELECT data FROM entries WHERE save_path = ? AND save_name = ? AND entry = ?", (save_path, save_name, entry))
+    return bytes(rows[0][0]) if rows else None
+
+  def replace(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    self.__execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (save_path, save_name, entry, data))
+
+  def append(self, save_path: str, save_name: str, entry: str, data: bytes) -> None:
+    self.__execute(
+      "INSERT INTO entries VALUES (?, ?, ?, ?) ON CONFLICT (save_path, save_name, entry) DO UPDATE SET data = CAST(data || excluded.data AS BLOB)", 
+      (save_path, save_name, entry, data)
+    )
+
+  def remove(self, save_path: str, save_name: str, entry: str) -> None:
+    self.__execute("DELETE FROM entries WHERE save_path = ? AND save_name = ? AND entry = ?", (save_path, save_name, entry))
+
+  def exists(self, save_path: str, save_name: str, entry: str) -> bool:
+    return bool(self.__execute("SELECT 1 FROM entries WHERE save_path = ? AND save_name = ? AND entry = ?", (save_path, save_name, entry)))
+
+  def entries(self, save_path: str, save_name: str) -> List[str]:
+    return [row[0] for row in self.__execute("SELECT entry FROM entries WHERE save_path = ? AND save_name = ? ORDER BY entry", (save_path, save_name))]
+
+  def save_names(self, save_path: str) -> List[str]:
+    return [row[0] for row in self.__execute("SELECT DISTINCT save_name FROM entries WHERE save_path = ? ORDER BY save_name", (save_path, ))]
+
+  def saves(self, save_root: str) -> List[Tuple[str, str]]:
+    rows = self.__execute(
+      "SELECT DISTINCT save_path, save_name FROM entries WHERE (save_path = ? OR substr(save_path, 1, ?) = ?) AND entry = 'Save Data - ' || save_name ORDER BY save_path, save_name", 
+      (save_root, len(save_root) + 1, f"{save_root}/")
+    )
+    return [(row[0], row[1]) for row in rows]
+
+  def delete_save(self, save_path: str, save_name: str) -> None:
+    self.__execute("DELETE FROM entries WHERE save_path = ? AND save_name = ?", (save_path, save_name))
+
+  def get_many(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Optional[bytes]]:
+    results = {key: None for key in keys}
+    keys = list(results)
+    with self._lock:
+      for idx in range(0, len(keys), self.BULK_CHUNK_SIZE):
+        chunk = keys[idx:idx + self.BULK_CHUNK_SIZE]
+        rows = self.connection().execute(
+          f"WITH keys (save_path, save_name, entry) AS (VALUES {', '.join(['(?, ?, ?)'] * len(chunk))}) SELECT save_path, save_name, entry, data FROM entries JOIN keys USING (save_path, save_name, entry)", 
+          [part for key in chunk for part in key]
+        )
+        for save_path, save_name, entry, data in rows:
+          results[(save_path, save_name, entry)] = bytes(data)
+    return results
+
+  def put_many(self, items: Dict[Tuple[str, str, str], bytes]) -> None:
+    with self._lock:
+      connection = self.connection()
+      connection.execute("BEGIN")
+      try:
+        connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", [(*key, data) for key, data in items.items()])
+        connection.execute("COMMIT")
+      except sqlite3.Error:
+        connection.execute("ROLLBACK")
+        raise
@@ -0,0 +1,177 @@
+"""
+A background writer for saved data, which coalesces save requests, along with the atomic file helpers used for saving
+"""
+
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+import atexit
+import os
+import threading
+
+from .errors import SaveError
+
+
+def write_atomic(path: str, data: bytes) -> None:
+  """
+  Writes data to a temporary file, syncs it to disk, and then renames it over the target so a crash never leaves a truncated file
+  """
+  directory = os.path.dirname(path)
+  if directory and not os.path.exists(directory):
+    os.makedirs(directory)
+  temporary_path = f"{path}.tmp"
+  with open(temporary_path, 'wb') as f:
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+  os.replace(temporary_path, path)
+  if directory and hasattr(os, "O_DIRECTORY"):  # Sync the directory entry too, where the platform allows it
+    directory_descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+      os.fsync(directory_descriptor)
+    finally:
+      os.close(directory_descriptor)
+
+
+def append_synced(path: str, data: bytes) -> None:
+  """
+  Appends data to a file, and syncs it to disk
+  """
+  directory = os.path.dirname(path)
+  if directory and not os.path.exists(directory):
+    os.makedirs(directory)
+  with open(path, 'ab') as f:
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def remove_file(path: str) -> None:
+  """
+  Removes a file if it exists
+  """
+  if os.path.exists(path):
+    os.remove(path)
+
+
+class SaveWriter:
+  """
+  A writer thread for a single save, to carry out its storage writes off of the calling thread
+  """
+  _writers: Dict[str, SaveWriter] = {}
+  _writers_lock = threading.Lock()
+
+  def __init__(self, backend: Any, save_path: str, save_name: str) -> None:
+    self.backend = backend
+    self.save_path = save_path
+    self.save_name = save_name
+    self.pending: List[Tuple[str, str, Optional[bytes]]] = []
+    self.is_busy = False
+    self.error = None
+    self.condition = threading.Condition()
+    self.thread = threading.Thread(target=self.__run, name=f"SaveWriter - {backend.location(save_path, save_name)}", daemon=True)
+    self.thread.start()
+
+  @classmethod
+  def for_save(cls, backend: Any, save_path: str, save_name: str) -> SaveWriter:
+    """
+    Fetches the writer for a save, creating and starting it if it does not exist yet
+    """
+    location = backend.location(save_path, save_name)
+    with cls._writers_lock:
+      if location not in cls._writers:
+        cls._writers[location] = cls(backend, save_path, save_name)
+      return cls._writers.get(location)
+
+  @classmethod
+  def forget_all(cls) -> None:
+    """
+    Drops every writer without waiting on it, for a forked child process, which inherits the writers but not their threads
+    """
+    cls._writers = {}
+    cls._writers_lock = threading.Lock()
+
+  @classmethod
+  def flush_save(cls, backend: Any, save_path: str, save_name: str) -> None:
+    """
+    Waits for the pending writes of a save to finish, if it has a writer
+    """
+    writer = cls._writers.get(backend.location(save_path, save_name))
+    if writer is not None:
+      writer.flush()
+
+  @classmethod
+  def flush_all(cls) -> None:
+    """
+    Waits for the pending writes of every save to finish, for use on shutdown
+    """
+    for writer in list(cls._writers.values()):
+      writer.flush()
+
+  def replace(self, entry: str, data: bytes) -> None:
+    """
+    Queues an atomic replacement of an entry's contents, superseding any earlier queued writes to that entry
+    """
+    self.__submit("replace", entry, data)
+
+  def append(self, entry: str, data: bytes) -> None:
+    """
+    Queues an append onto the end of an entry
+    """
+    self.__submit("append", entry, data)
+
+  def remove(self, entry: str) -> None:
+    """
+    Queues the removal of an entry, superseding any earlier queued writes to that entry
+    """
+    self.__submit("remove", entry, None)
+
+  def wait(self, timeout: Optional[float]=None) -> bool:
+    """
+    Blocks until every queued write has finished, and returns whether they did so within the timeout
+    """
+    with self.condition:
+      return self.condition.wait_for(lambda: not self.pending and not self.is_busy, timeout)
+
+  def flush(self) -> None:
+    """
+    Blocks until every queued write has finished, raising any error that the writer thread met
+    """
+    self.wait()
+    if self.error is not None:
+      error, self.error = self.error, None
+      raise SaveError(f"Background save failed: {error}") from error
+
+  def __submit(self, operation: str, entry: str, data: Optional[bytes]) -> None:
+    """
+    A mangled helper method to queue a write, coalescing it with the queued writes it makes redundant
+    """
+    with self.condition:
+      if operation != "append":  # A replacement or removal makes every earlier write to the same entry redundant
+        self.pending = [write for write in self.pending if write[1] != entry]
+      self.pending.append((operation, entry, data))
+      self.condition.notify_all()
+
+  def __run(self) -> None:
+    """
+    A mangled helper method containing the writer thread loop, which carries out queued writes in order
+    """
+    while True:
+      with self.condition:
+        self.condition.wait_for(lambda: self.pending)
+        writes, self.pending = self.pending, []
+        self.is_busy = True
+      for operation, entry, data in writes:
+        try:
+          getattr(self.backend, operation)(self.save_path, self.save_name, entry, *([] if data is None else [data]))
+        except Exception as e:  # Kept until the next flush, as there is no caller to raise to
+          self.error = e
+      with self.condition:
+        self.is_busy = False
+        self.condition.notify_all()
+
+
+atexit.register(SaveWriter.flush_all)
+if hasattr(os, "register_at_fork"):
+  os.register_at_fork(after_in_child=SaveWriter.forget_all)